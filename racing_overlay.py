@@ -7,13 +7,16 @@ import sys
 import os
 import time
 import math
+import random
 import threading
 import socket
 import struct
-from collections import deque
 import ctypes
 from ctypes import wintypes
 import mmap
+import operator
+
+import numpy as np
 
 # Import physics calculations
 try:
@@ -25,14 +28,22 @@ except ImportError:
 # Verificar se PySide está disponível
 try:
     from PySide6.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QProgressBar
-    from PySide6.QtCore import Qt, QTimer, Signal, QPoint
-    from PySide6.QtGui import QFont, QPalette, QColor, QPainter, QPen, QBrush, QPolygon
+    from PySide6.QtCore import Qt, QTimer, QThread, Signal, QPoint, QPointF, QRectF, QLineF, QSocketNotifier
+    from PySide6.QtGui import QFont, QPalette, QColor, QPainter, QPen, QBrush, QPolygon, QPolygonF, QSurfaceFormat, QPixmap
+    try:
+        import shiboken6 as shiboken
+    except ImportError:
+        shiboken = None
     PYSIDE_VERSION = "PySide6"
 except ImportError:
     try:
         from PySide2.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QProgressBar
-        from PySide2.QtCore import Qt, QTimer, Signal, QPoint
-        from PySide2.QtGui import QFont, QPalette, QColor, QPainter, QPen, QBrush, QPolygon
+        from PySide2.QtCore import Qt, QTimer, QThread, Signal, QPoint, QPointF, QRectF, QLineF, QSocketNotifier
+        from PySide2.QtGui import QFont, QPalette, QColor, QPainter, QPen, QBrush, QPolygon, QPolygonF, QSurfaceFormat, QPixmap
+        try:
+            import shiboken2 as shiboken
+        except ImportError:
+            shiboken = None
         PYSIDE_VERSION = "PySide2"
     except ImportError:
         print("ERROR: Nem PySide6 nem PySide2 estao instalados!")
@@ -180,6 +191,41 @@ class rF2Extended(ctypes.Structure):
         ("mSessionStarted", ctypes.c_bool),                   # session started - ANOTHER GAME STATE CHECK!
     ]
 
+def _build_vehicle_fast_struct():
+    """
+    Pre-compiled struct that reads only the rF2VehicleTelemetry fields used
+    by the overlay, straight from the raw buffer at their ctypes offsets
+    """
+    fields = (
+        (rF2VehicleTelemetry.mID.offset, 'i'),
+        (rF2VehicleTelemetry.mLocalVel.offset + rF2Vec3.z.offset, 'd'),
+        (rF2VehicleTelemetry.mLocalAccel.offset + rF2Vec3.x.offset, 'd'),
+        (rF2VehicleTelemetry.mLocalAccel.offset + rF2Vec3.y.offset, 'd'),
+        (rF2VehicleTelemetry.mLocalAccel.offset + rF2Vec3.z.offset, 'd'),
+        (rF2VehicleTelemetry.mGear.offset, 'i'),
+        (rF2VehicleTelemetry.mEngineRPM.offset, 'd'),
+        (rF2VehicleTelemetry.mUnfilteredThrottle.offset, 'd'),
+        (rF2VehicleTelemetry.mUnfilteredBrake.offset, 'd'),
+    )
+    fmt = '<'
+    position = 0
+    for offset, code in fields:
+        fmt += f'{offset - position}x{code}'
+        position = offset + struct.calcsize('<' + code)
+    return struct.Struct(fmt)
+
+# (mID, vel_z, accel_x, accel_y, accel_z, gear, rpm, throttle, brake)
+_VEHICLE_FAST = _build_vehicle_fast_struct()
+_VEHICLE_SIZE = ctypes.sizeof(rF2VehicleTelemetry)
+
+
+def _rmnan(value, _isnan=math.isnan, _isinf=math.isinf):
+    """Função rmnan: inf/nan -> 0.0 (definida uma vez, fora do loop de leitura)"""
+    return 0.0 if (_isnan(value) or _isinf(value)) else value
+
+# (speed, gear) usado na busca ampla de fallback
+_SPEED_GEAR = struct.Struct('<fi')
+
 class RF2TelemetryManager:
     """
     Advanced rFactor2 Telemetry Manager
@@ -464,15 +510,42 @@ class RF2TelemetryManager:
                 self.is_in_realtime and
                 time.time() - self.last_valid_data_time < self.data_stale_timeout)
 
+def _sim_step(t, _sin=math.sin, _pi=math.pi):
+    """Pedais simulados no instante t -> (throttle, brake)
+
+    Só aritmética em floats: math.sin ligado como default (sem lookup de
+    atributo) e comparações inline no lugar de max().
+    """
+    throttle_base = 0.5 + 0.4 * _sin(t * 0.7)
+    if throttle_base < 0.0:
+        throttle_base = 0.0
+    brake_base = 0.3 + 0.3 * _sin(t * 0.4 + _pi)
+
+    throttle = throttle_base + _sin(t * 2.1) * 0.1
+    brake = brake_base if brake_base > 0.2 else 0.0
+
+    if brake > 0.3:
+        throttle *= 0.2
+    return throttle, brake
+
+
 class RealPedalReader:
     """Leitor REAL de pedais usando pygame (compatível com G920, etc)"""
+    # Timeout da espera por eventos de eixo (ms): releitura periódica e saída rápida no stop()
+    EVENT_WAIT_MS = 50
+    RING_SIZE = 256  # potência de 2: índice = head & (RING_SIZE - 1)
+
     def __init__(self):
-        self.throttle = 0.0
-        self.brake = 0.0
+        # Ring SPSC de amostras (t, throttle, brake): a thread do pygame escreve a
+        # linha inteira e só então avança _head; o consumidor lê a linha head-1.
+        # Assim throttle/brake sempre chegam como par consistente, sem lock.
+        self._ring = np.zeros((self.RING_SIZE, 3), dtype=np.float64)
+        self._head = 0
         self.connected = False
         self.running = False
         self.thread = None
         self.joysticks = []
+        self._pygame = None  # módulo pygame, resolvido uma vez em start()
 
         # Configuração de mapeamento
         self.throttle_axis = None
@@ -480,6 +553,28 @@ class RealPedalReader:
         self.throttle_joystick = None
         self.brake_joystick = None
 
+    def _publish(self, throttle, brake):
+        """Produtor: grava a amostra no slot livre e depois publica o novo head"""
+        head = self._head
+        self._ring[head & (self.RING_SIZE - 1)] = (time.perf_counter(), throttle, brake)
+        self._head = head + 1
+
+    def latest(self):
+        """Consumidor: (throttle, brake) da amostra mais recente"""
+        head = self._head
+        if not head:
+            return 0.0, 0.0
+        _, throttle, brake = self._ring[(head - 1) & (self.RING_SIZE - 1)].tolist()
+        return throttle, brake
+
+    @property
+    def throttle(self):
+        return self.latest()[0]
+
+    @property
+    def brake(self):
+        return self.latest()[1]
+
     def start(self):
         """Inicia leitura REAL de pedais"""
         print(f"  Iniciando leitor REAL de pedais...")
@@ -487,6 +582,7 @@ class RealPedalReader:
         try:
             # Importar pygame aqui para não interferir com Qt
             import pygame
+            self._pygame = pygame
 
             # Inicializar apenas joystick
             pygame.init()
@@ -558,11 +654,17 @@ class RealPedalReader:
 
     def _real_read_loop(self):
         """Loop de leitura REAL dos pedais"""
-        import pygame
+        pygame = self._pygame
+        wait_event = pygame.event.wait
+        clear_events = pygame.event.clear
 
         while self.running:
             try:
-                pygame.event.pump()  # Atualiza eventos
+                # Bloqueia até o próximo evento (SDL_WaitEventTimeout) em vez de dormir
+                # 16ms: o movimento do pedal é lido assim que chega. O estado dos eixos
+                # já foi atualizado pelo SDL, então o resto da fila é só descartado.
+                wait_event(self.EVENT_WAIT_MS)
+                clear_events()
 
                 # Ler throttle
                 new_throttle = 0.0
@@ -579,10 +681,7 @@ class RealPedalReader:
                         new_brake = self._normalize_axis(raw_brake)
 
                 # Atualizar valores
-                self.throttle = new_throttle
-                self.brake = new_brake
-
-                time.sleep(0.016)  # ~60fps
+                self._publish(new_throttle, new_brake)
 
             except Exception as e:
                 if self.running:
@@ -607,15 +706,8 @@ class RealPedalReader:
     def _simulation_loop(self):
         """Loop de simulação de dados"""
         while self.running:
-            t = time.time()
-            throttle_base = max(0, 0.5 + 0.4 * math.sin(t * 0.7))
-            brake_base = max(0, 0.3 + 0.3 * math.sin(t * 0.4 + math.pi))
-
-            self.throttle = throttle_base + math.sin(t * 2.1) * 0.1
-            self.brake = brake_base if brake_base > 0.2 else 0
-
-            if self.brake > 0.3:
-                self.throttle *= 0.2
+            throttle, brake = _sim_step(time.time())
+            self._publish(throttle, brake)
 
             time.sleep(0.016)
 
@@ -627,7 +719,7 @@ class RealPedalReader:
 
         # Cleanup pygame se foi inicializado
         if self.joysticks:
-            import pygame
+            pygame = self._pygame
             for joystick in self.joysticks:
                 if joystick.get_init():
                     joystick.quit()
@@ -639,7 +731,10 @@ class TelemetryDataReader:
 
     def __init__(self):
         self.running = False
-        self.thread = None
+
+        # Leitura orientada a eventos no loop do Qt (sem thread dedicada)
+        self._f1_notifier = None
+        self._rf2_timer = None
 
         # Current telemetry data
         self.throttle = 0.0
@@ -669,6 +764,8 @@ class TelemetryDataReader:
         # UDP socket for F1 data
         self.f1_socket = None
         self.f1_port = 20777
+        self.f1_timeout = 0.1  # F1 considerado ativo se houve pacote nos últimos 100ms
+        self._last_f1_packet = 0.0
 
         # NOVO SISTEMA CORRIGIDO - Usar telemetria rF2 oficial
         self.rf2_telemetry = None
@@ -688,15 +785,28 @@ class TelemetryDataReader:
         self.last_valid_read = 0
         self.max_connection_failures = 10
 
+        # Último offset válido da estrutura de veículo no shared memory legado
+        self._lmu_base_offset = None
+
+        # Log com limite de frequência (chave -> último instante impresso)
+        self._log_last = {}
+
     def start(self):
         """Start telemetry data reading"""
         print("Starting enhanced telemetry reader...")
         self.running = True
-        self.thread = threading.Thread(target=self._read_telemetry_loop, daemon=True)
-        self.thread.start()
 
         # Try to connect to F1 UDP
         self._setup_f1_connection()
+        if self.f1_socket:
+            self._f1_notifier = QSocketNotifier(self.f1_socket.fileno(), QSocketNotifier.Read)
+            self._f1_notifier.activated.connect(self._on_f1_ready)
+
+        # Polling de rF2/LMU a ~30fps no loop de eventos do Qt
+        self._rf2_timer = QTimer()
+        self._rf2_timer.setTimerType(Qt.CoarseTimer)  # sem precisão sub-ms: o SO agrupa os wakeups
+        self._rf2_timer.timeout.connect(self._poll_telemetry)
+        self._rf2_timer.start(33)
 
         # NOVO: Iniciar sistema corrigido de rF2
         if self.rf2_telemetry:
@@ -716,6 +826,12 @@ class TelemetryDataReader:
         print("Stopping telemetry reader...")
         self.running = False
 
+        # Stop event sources
+        if self._rf2_timer:
+            self._rf2_timer.stop()
+        if self._f1_notifier:
+            self._f1_notifier.setEnabled(False)
+
         # Close sockets
         if self.f1_socket:
             try:
@@ -740,21 +856,12 @@ class TelemetryDataReader:
             except:
                 pass
 
-        # Wait for thread to finish
-        if self.thread and self.thread.is_alive():
-            print("  Waiting for telemetry thread to stop...")
-            self.thread.join(timeout=2.0)
-            if self.thread.is_alive():
-                print("  Warning: Telemetry thread did not stop cleanly")
-            else:
-                print("  Telemetry thread stopped")
-
     def _setup_f1_connection(self):
         """Setup UDP connection for F1 telemetry"""
         try:
             self.f1_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.f1_socket.bind(("127.0.0.1", self.f1_port))
-            self.f1_socket.settimeout(0.1)  # 100ms timeout
+            self.f1_socket.setblocking(False)  # Lido via QSocketNotifier
             print(f"F1 UDP telemetry listening on port {self.f1_port}")
         except Exception as e:
             print(f"Failed to setup F1 connection: {e}")
@@ -790,42 +897,54 @@ class TelemetryDataReader:
             self.lmu_connected = False
             self.rf2_shared_memory = None
 
-    def _read_telemetry_loop(self):
-        """Main telemetry reading loop"""
-        while self.running:
-            try:
-                # Try F1 UDP data first
-                if self._read_f1_data():
-                    self.current_game = "F1 2024/2023"
-                    self.connection_status = "F1 Connected"
-                    self.connected = True
-                # NOVO: Try sistema corrigido de rF2/LMU
-                elif self._read_rf2_corrected_data():
-                    self.current_game = "Le Mans Ultimate"
-                    self.connection_status = "LMU Connected"
-                    self.connected = True
-                # Fallback: Try legacy LMU shared memory
-                elif self._read_lmu_data():
-                    self.current_game = "Le Mans Ultimate"
-                    self.connection_status = "LMU Connected"
-                    self.connected = True
-                else:
-                    # No real telemetry data available
-                    self.current_game = "No Game"
-                    self.connection_status = "Offline"
-                    self.connected = False
-                    # Reset G-force data to zero when no game data
-                    self.gforce_longitudinal = 0.0
-                    self.gforce_lateral = 0.0
-                    self.gforce_vertical = 0.0
-
-                # Update G-force calculations
-                self._update_gforce_calculations()
+    def _log_rl(self, key, msg, period=1.0):
+        """Imprime msg no máximo uma vez por período para cada chave"""
+        now = time.monotonic()
+        if now - self._log_last.get(key, 0.0) >= period:
+            self._log_last[key] = now
+            print(msg)
+
+    def _on_f1_ready(self):
+        """Slot do QSocketNotifier: pacote F1 disponível no socket"""
+        if self._read_f1_data():
+            self._last_f1_packet = time.time()
+
+    def _poll_telemetry(self):
+        """Telemetry polling tick (QTimer, ~30fps)"""
+        if not self.running:
+            return
 
-            except Exception as e:
-                print(f"Telemetry read error: {e}")
+        try:
+            # F1 UDP data first (recebido pelo QSocketNotifier)
+            if time.time() - self._last_f1_packet < self.f1_timeout:
+                self.current_game = "F1 2024/2023"
+                self.connection_status = "F1 Connected"
+                self.connected = True
+            # NOVO: Try sistema corrigido de rF2/LMU
+            elif self._read_rf2_corrected_data():
+                self.current_game = "Le Mans Ultimate"
+                self.connection_status = "LMU Connected"
+                self.connected = True
+            # Fallback: Try legacy LMU shared memory
+            elif self._read_lmu_data():
+                self.current_game = "Le Mans Ultimate"
+                self.connection_status = "LMU Connected"
+                self.connected = True
+            else:
+                # No real telemetry data available
+                self.current_game = "No Game"
+                self.connection_status = "Offline"
+                self.connected = False
+                # Reset G-force data to zero when no game data
+                self.gforce_longitudinal = 0.0
+                self.gforce_lateral = 0.0
+                self.gforce_vertical = 0.0
+
+            # Update G-force calculations
+            self._update_gforce_calculations()
 
-            time.sleep(0.033)  # ~30fps
+        except Exception as e:
+            self._log_rl("read_error", f"Telemetry read error: {e}")
 
     def _read_f1_data(self) -> bool:
         """Read F1 UDP telemetry data"""
@@ -842,7 +961,6 @@ class TelemetryDataReader:
                 # These are placeholder positions - actual F1 parsing requires packet header analysis
 
                 # Simulate extraction (replace with actual F1 packet parsing)
-                import random
                 self.throttle = min(100.0, max(0.0, random.uniform(0, 100)))
                 self.brake = min(100.0, max(0.0, random.uniform(0, 100)))
                 self.speed = random.uniform(0, 300)
@@ -856,11 +974,11 @@ class TelemetryDataReader:
 
                 return True
 
-        except socket.timeout:
+        except BlockingIOError:
             # No data available
             pass
         except Exception as e:
-            print(f"F1 data read error: {e}")
+            self._log_rl("f1_error", f"F1 data read error: {e}")
 
         return False
 
@@ -898,7 +1016,7 @@ class TelemetryDataReader:
             return False
 
         except Exception as e:
-            print(f"Sistema corrigido rF2 erro: {e}")
+            self._log_rl("rf2_error", f"Sistema corrigido rF2 erro: {e}")
             return False
 
     def _read_lmu_data_new(self) -> bool:
@@ -958,33 +1076,30 @@ class TelemetryDataReader:
             try:
                 # rF2 telemetry structure starts with header info
                 # Skip to vehicle telemetry data (usually around offset 64-128)
-                for base_offset in [64, 128, 256, 512]:
-                    if base_offset + ctypes.sizeof(rF2VehicleTelemetry) > len(raw_data):
+                # Em regime estável o último offset válido é testado primeiro
+                base_offsets = [64, 128, 256, 512]
+                if self._lmu_base_offset is not None:
+                    base_offsets.remove(self._lmu_base_offset)
+                    base_offsets.insert(0, self._lmu_base_offset)
+
+                for base_offset in base_offsets:
+                    if base_offset + _VEHICLE_SIZE > len(raw_data):
                         continue
 
                     try:
-                        # Try to cast raw data to rF2VehicleTelemetry structure
-                        vehicle_data = rF2VehicleTelemetry.from_buffer_copy(
-                            raw_data[base_offset:base_offset + ctypes.sizeof(rF2VehicleTelemetry)]
-                        )
+                        # Lê apenas os campos necessários direto do buffer
+                        (vehicle_id, vel_z, accel_x, accel_y, accel_z,
+                         gear, rpm, throttle, brake) = _VEHICLE_FAST.unpack_from(raw_data, base_offset)
 
                         # Validate vehicle data - more lenient validation otimizado
-                        if (0 <= vehicle_data.mID <= 127):    # Valid vehicle ID range - that's enough!
+                        if (0 <= vehicle_id <= 127):    # Valid vehicle ID range - that's enough!
                             # Implementação adequada:
-                            # Get acceleration data from mLocalAccel
-                            accel_x = vehicle_data.mLocalAccel.x  # Lateral
-                            accel_y = vehicle_data.mLocalAccel.y  # Vertical
-                            accel_z = vehicle_data.mLocalAccel.z  # Longitudinal
+                            # Acceleration data from mLocalAccel (X lateral, Y vertical, Z longitudinal)
 
                             # Função rmnan - handle inf/nan values
-                            def rmnan(value):
-                                if math.isnan(value) or math.isinf(value):
-                                    return 0.0
-                                return value
-
-                            accel_x = rmnan(accel_x)
-                            accel_y = rmnan(accel_y)
-                            accel_z = rmnan(accel_z)
+                            accel_x = _rmnan(accel_x)
+                            accel_y = _rmnan(accel_y)
+                            accel_z = _rmnan(accel_z)
 
                             # Validate acceleration values are reasonable (be more lenient)
                             if (abs(accel_x) < 200 and abs(accel_y) < 200 and abs(accel_z) < 200 and
@@ -1002,11 +1117,12 @@ class TelemetryDataReader:
                                 # G-force validation removed
 
                                 # Get other basic telemetry data
-                                self.speed = max(0, rmnan(vehicle_data.mLocalVel.z) * 3.6)  # Z velocity to km/h
-                                self.throttle = max(0, min(100, rmnan(vehicle_data.mUnfilteredThrottle) * 100))
-                                self.brake = max(0, min(100, rmnan(vehicle_data.mUnfilteredBrake) * 100))
-                                self.gear = max(-1, vehicle_data.mGear)
-                                self.rpm = max(0, rmnan(vehicle_data.mEngineRPM))
+                                self.speed = max(0, _rmnan(vel_z) * 3.6)  # Z velocity to km/h
+                                self.throttle = max(0, min(100, _rmnan(throttle) * 100))
+                                self.brake = max(0, min(100, _rmnan(brake) * 100))
+                                self.gear = max(-1, gear)
+                                self.rpm = max(0, _rmnan(rpm))
+                                self._lmu_base_offset = base_offset
 
                                 # G-force data processed
 
@@ -1019,20 +1135,19 @@ class TelemetryDataReader:
                         continue  # Try next offset
 
                 # If no valid structure found at specific offsets, try a broader search
-                print("Trying broader search for telemetry data...")
+                self._log_rl("broad_search", "Trying broader search for telemetry data...")
 
                 # Fallback: try to find ANY valid data pattern
                 for offset in range(0, min(len(raw_data) - 1024, 4096), 64):
                     try:
                         # Simple validation: look for reasonable speed/gear values
-                        test_speed = struct.unpack('f', raw_data[offset:offset+4])[0] if offset+4 <= len(raw_data) else -999
-                        test_gear = struct.unpack('i', raw_data[offset+4:offset+8])[0] if offset+8 <= len(raw_data) else -999
+                        test_speed, test_gear = _SPEED_GEAR.unpack_from(raw_data, offset)
 
                         if 0 <= test_speed <= 150 and -1 <= test_gear <= 10:  # Reasonable values
                             # Found some valid-looking data, maintain connection
                             self.speed = test_speed * 3.6
                             self.gear = test_gear
-                            print(f"Fallback data found: Speed={self.speed:.1f}km/h, Gear={self.gear}")
+                            self._log_rl("fallback_found", f"Fallback data found: Speed={self.speed:.1f}km/h, Gear={self.gear}")
                             return True
                     except:
                         continue
@@ -1044,15 +1159,15 @@ class TelemetryDataReader:
                 if self.connection_failures < self.max_connection_failures:
                     # If we had recent valid data, maintain connection status
                     if time.time() - self.last_valid_read < 5.0:  # Within last 5 seconds
-                        print(f"Connection issue {self.connection_failures}/{self.max_connection_failures}, maintaining connection...")
+                        self._log_rl("conn_issue", f"Connection issue {self.connection_failures}/{self.max_connection_failures}, maintaining connection...")
                         return True  # Maintain connection temporarily
 
-                print(f"No valid rF2 telemetry structure found (failures: {self.connection_failures})")
+                self._log_rl("no_structure", f"No valid rF2 telemetry structure found (failures: {self.connection_failures})")
                 return False
 
             except Exception as struct_error:
                 self.connection_failures += 1
-                print(f"Structure parsing error: {struct_error} (failures: {self.connection_failures})")
+                self._log_rl("struct_error", f"Structure parsing error: {struct_error} (failures: {self.connection_failures})")
 
                 # Maintain connection if we had recent success
                 if (self.connection_failures < self.max_connection_failures and
@@ -1062,7 +1177,7 @@ class TelemetryDataReader:
 
         except Exception as e:
             self.connection_failures += 1
-            print(f"LMU data read error: {e} (failures: {self.connection_failures})")
+            self._log_rl("lmu_error", f"LMU data read error: {e} (failures: {self.connection_failures})")
 
             # Maintain connection if we had recent success
             if (self.connection_failures < self.max_connection_failures and
@@ -1091,11 +1206,14 @@ class TelemetryDataReader:
                 self.gforce_vertical * 9.81
             )
         else:
+            longitudinal = self.gforce_longitudinal
+            lateral = self.gforce_lateral
+            vertical = self.gforce_vertical
             return {
-                'longitudinal': self.gforce_longitudinal,
-                'lateral': self.gforce_lateral,
-                'vertical': self.gforce_vertical,
-                'total': math.sqrt(self.gforce_longitudinal**2 + self.gforce_lateral**2 + self.gforce_vertical**2)
+                'longitudinal': longitudinal,
+                'lateral': lateral,
+                'vertical': vertical,
+                'total': math.hypot(longitudinal, lateral, vertical)
             }
 
     def get_basic_telemetry(self) -> dict:
@@ -1111,6 +1229,54 @@ class TelemetryDataReader:
         }
 
 
+class TelemetryWorker(QThread):
+    """
+    Aquisição de pedais e telemetria fora da thread da UI
+    Emite um snapshot consolidado (~30fps) consumido pelo overlay
+    """
+    data_ready = Signal(dict)
+
+    def __init__(self, pedal_reader, telemetry_reader, interval_ms=33):
+        super().__init__()
+        self.pedal_reader = pedal_reader
+        self.telemetry_reader = telemetry_reader
+        self.interval_ms = interval_ms
+
+    def run(self):
+        """Event loop da thread: timers/notifier do leitor pertencem a ela"""
+        self.telemetry_reader.start()
+
+        latest_pedals = self.pedal_reader.latest
+
+        def emit_snapshot():
+            if self.isInterruptionRequested():
+                return
+            throttle, brake = latest_pedals()
+            self.data_ready.emit({
+                'throttle': throttle,
+                'brake': brake,
+                'gforce': self.telemetry_reader.get_gforce_data(),
+                'telemetry': self.telemetry_reader.get_basic_telemetry(),
+            })
+
+        sample_timer = QTimer()
+        sample_timer.setTimerType(Qt.CoarseTimer)  # tick de UI a ~30fps não precisa de timer multimídia
+        sample_timer.timeout.connect(emit_snapshot)
+        sample_timer.start(self.interval_ms)
+
+        self.exec()
+
+        # Parar fontes de eventos na própria thread que as criou
+        sample_timer.stop()
+        self.telemetry_reader.stop()
+
+    def stop(self):
+        """Encerra o event loop da thread e aguarda a finalização"""
+        self.requestInterruption()
+        self.quit()
+        self.wait()
+
+
 class GForceCircle(QWidget):
     """Friction Circle for G-Force visualization - Implementação adequada"""
     def __init__(self, show_labels=True):
@@ -1144,6 +1310,19 @@ class GForceCircle(QWidget):
         self.last_x = self.area_center
         self.last_y = self.area_center
 
+        # Geometria estática pré-calculada (só muda com o tamanho)
+        self._main_rect = self._circle_rect(self.display_radius_g * self.global_scale)
+        self._ref_rects = [
+            self._circle_rect(g_value * self.global_scale)
+            for g_value in (1.0, 2.0) if g_value <= self.display_radius_g
+        ]
+        cross_size = 10
+        c = self.area_center
+        self._cross_lines = [
+            QLineF(c - cross_size, c, c + cross_size, c),
+            QLineF(c, c - cross_size, c, c + cross_size),
+        ]
+
         # Colors (estilo otimizado)
         self.bg_color = QColor(40, 40, 40)
         self.circle_color = QColor(80, 80, 80)
@@ -1151,6 +1330,20 @@ class GForceCircle(QWidget):
         self.grid_color = QColor(100, 100, 100)
         self.text_color = QColor(255, 255, 255)
 
+        # Pens/brushes criados uma vez (não a cada paintEvent)
+        self._circle_pen = QPen(self.circle_color, 2)
+        self._ref_pen = QPen(self.grid_color, 1, Qt.DashLine)
+        self._cross_pen = QPen(self.grid_color, 1)
+        self._dot_pen = QPen(Qt.black, 2)
+        self._dot_brush = QBrush(self.dot_color)
+        self._no_brush = QBrush()
+        self._text_pen = QPen(self.text_color)
+        self._text_font = QFont("Arial", 10)
+
+    def _circle_rect(self, radius):
+        """Retângulo de um círculo centrado na área de desenho"""
+        return QRectF(self.area_center - radius, self.area_center - radius, radius * 2, radius * 2)
+
     def update_gforce(self, lateral, longitudinal):
         """Update G-force values and position"""
         self.gforce_lateral = lateral
@@ -1178,43 +1371,23 @@ class GForceCircle(QWidget):
         painter.fillRect(self.rect(), self.bg_color)
 
         # Draw main circle
-        painter.setPen(QPen(self.circle_color, 2))
-        painter.setBrush(QBrush())
-        circle_radius = self.display_radius_g * self.global_scale
-        painter.drawEllipse(
-            self.area_center - circle_radius,
-            self.area_center - circle_radius,
-            circle_radius * 2,
-            circle_radius * 2
-        )
+        painter.setPen(self._circle_pen)
+        painter.setBrush(self._no_brush)
+        painter.drawEllipse(self._main_rect)
 
         # Draw reference circles (1G, 2G)
-        painter.setPen(QPen(self.grid_color, 1, Qt.DashLine))
-        for g_value in [1.0, 2.0]:
-            if g_value <= self.display_radius_g:
-                ref_radius = g_value * self.global_scale
-                painter.drawEllipse(
-                    self.area_center - ref_radius,
-                    self.area_center - ref_radius,
-                    ref_radius * 2,
-                    ref_radius * 2
-                )
+        painter.setPen(self._ref_pen)
+        for ref_rect in self._ref_rects:
+            painter.drawEllipse(ref_rect)
 
         # Draw center cross
-        painter.setPen(QPen(self.grid_color, 1))
-        cross_size = 10
-        painter.drawLine(
-            self.area_center - cross_size, self.area_center,
-            self.area_center + cross_size, self.area_center
-        )
-        painter.drawLine(
-            self.area_center, self.area_center - cross_size,
-            self.area_center, self.area_center + cross_size
-        )
+        painter.setPen(self._cross_pen)
+        for line in self._cross_lines:
+            painter.drawLine(line)
 
         # Draw current G-force dot
-        painter.setPen(QPen(Qt.black, 2))
-        painter.setBrush(QBrush(self.dot_color))
+        painter.setPen(self._dot_pen)
+        painter.setBrush(self._dot_brush)
         painter.drawEllipse(
             self.last_x - self.dot_size/2,
             self.last_y - self.dot_size/2,
@@ -1224,9 +1397,8 @@ class GForceCircle(QWidget):
 
         # Draw G-force values as text (apenas se show_labels for True)
         if self.show_labels:
-            painter.setPen(QPen(self.text_color))
-            font = QFont("Arial", 10)
-            painter.setFont(font)
+            painter.setPen(self._text_pen)
+            painter.setFont(self._text_font)
 
             # Current values in corners
             painter.drawText(10, 20, f"Lat: {abs(self.gforce_lateral):.2f}G")
@@ -1242,70 +1414,400 @@ class GForceCircle(QWidget):
                 painter.drawText(150, 40, direction)
 
 
-class GraphCanvas(QWidget):
-    """Canvas para desenhar o gráfico histórico - PARTE PRINCIPAL!"""
+class SampleRing:
+    """
+    Histórico de tamanho fixo num buffer circular NumPy
+
+    Cada amostra é gravada em duas posições (i e i + size), então a janela
+    cronológica é sempre uma fatia contígua do array - sem cópia nem np.roll.
+    """
+    def __init__(self, size, dtype=np.float32):
+        self.size = size
+        self._data = np.zeros(2 * size, dtype=dtype)
+        self._pos = 0    # próxima posição de escrita
+        self._count = 0
+
+    def append(self, value):
+        pos = self._pos
+        self._data[pos] = value
+        self._data[pos + self.size] = value
+        self._pos = pos + 1 if pos + 1 < self.size else 0
+        if self._count < self.size:
+            self._count += 1
+
+    def view(self):
+        """Amostras em ordem cronológica (view do buffer interno, não copiar/alterar)"""
+        if self._count < self.size:
+            return self._data[:self._count]
+        return self._data[self._pos:self._pos + self.size]
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        return self.view()[key]
+
+    def __array__(self, dtype=None, copy=None):
+        view = self.view()
+        return view if dtype is None else view.astype(dtype)
+
+
+class PolylineBuffer:
+    """
+    QPolygonF persistente com uma view NumPy (n, 2) sobre os próprios pontos
+
+    As coordenadas são escritas direto na memória do polígono (QPointF = 2
+    doubles), sem criar QPointF nem listas a cada frame. A view só é refeita
+    quando o número de pontos muda. Sem shiboken (ou se o binding não expõe o
+    ponteiro), cai para um array NumPy comum + QPolygonF montado por lista.
+    """
     def __init__(self):
+        self.polygon = QPolygonF()
+        self._xy = np.empty((0, 2), dtype=np.float64)
+        self._direct = shiboken is not None
+
+    def _view(self, n):
+        if len(self._xy) != n:
+            if self._direct:
+                try:
+                    self.polygon.resize(n)
+                    ptr = shiboken.VoidPtr(self.polygon.data(), n * 16, True)
+                    self._xy = np.frombuffer(ptr, dtype=np.float64).reshape(n, 2)
+                    return self._xy
+                except (AttributeError, TypeError, ValueError):
+                    self._direct = False
+            self._xy = np.empty((n, 2), dtype=np.float64)
+        return self._xy
+
+    def fill(self, xs, history, bottom, height):
+        """x já calculado; y = bottom - valor * height. Retorna o polígono atualizado"""
+        xy = self._view(len(xs))
+        xy[:, 0] = xs
+        ys = xy[:, 1]
+        np.multiply(history, -height, out=ys)
+        ys += bottom
+        if not self._direct:
+            self.polygon = QPolygonF([QPointF(x, y) for x, y in xy.tolist()])
+        return self.polygon
+
+
+class GraphCanvas(QWidget):
+    """Canvas para desenhar o gráfico histórico - PARTE PRINCIPAL!
+
+    O gráfico é mantido num QPixmap persistente: com o histórico cheio, cada
+    atualização só rola o pixmap para a esquerda e desenha a faixa nova à
+    direita (estilo waterfall). O redesenho completo só acontece enquanto o
+    histórico enche ou quando o widget muda de tamanho.
+    """
+    ANTIALIAS = False   # traço de 2px a 30Hz: o rasterizador sem AA é mais rápido e a diferença não aparece
+    AA_MIN_WIDTH = 200  # com ANTIALIAS ligado, largura (px lógicos) abaixo da qual ele é desligado
+
+    def __init__(self, max_samples=150):
         super().__init__()
+        self.max_samples = max_samples
         self.throttle_history = []
         self.brake_history = []
+        self._x_axis = np.arange(0, dtype=np.float64)  # índices das amostras, cresce sob demanda
+        self._pixmap = None
+        self._bg_pixmap = None  # background + grid pré-renderizados (invalidado no resize)
+        self._throttle_line = PolylineBuffer()  # polígonos reaproveitados entre frames
+        self._brake_line = PolylineBuffer()
+        self._last_x = 0.0  # x (lógico) da amostra mais recente dentro do pixmap
+
+        # Pens/brushes criados uma vez (não a cada redesenho)
+        self._throttle_pen = QPen(QColor(0, 255, 120), 2)
+        self._brake_pen = QPen(QColor(255, 50, 80), 2)
+        self._grid_pen = QPen(QColor(80, 80, 80, 60), 1)
+        self._bg_brush = QBrush(QColor(40, 40, 40, 200))
         self.setStyleSheet("background-color: rgba(20, 20, 35, 150); border: 1px solid rgba(100, 200, 255, 100);")
 
-    def update_data(self, throttle_history, brake_history):
-        """Atualiza dados do gráfico"""
+    def update_data(self, throttle_history, brake_history, new_samples=None):
+        """Atualiza dados do gráfico
+
+        new_samples: quantas amostras entraram desde a última chamada
+        (None força redesenho completo)
+        """
         self.throttle_history = throttle_history
         self.brake_history = brake_history
+
+        n = len(throttle_history)
+        if (self._pixmap is None or new_samples is None or n < self.max_samples
+                or new_samples >= n - 1 or self._pixmap_stale()):
+            self._redraw_pixmap()
+        elif new_samples > 0:
+            self._scroll_pixmap(new_samples)
         self.update()  # Redesenha
 
+    def _graph_rect(self):
+        """Área de desenho (widget menos a margem)"""
+        margin = 5
+        return QRectF(self.rect().adjusted(margin, margin, -margin, -margin))
+
+    def _pixmap_stale(self, pixmap=None):
+        """Pixmap (padrão: o do gráfico) não corresponde mais ao tamanho/DPR do widget"""
+        if pixmap is None:
+            pixmap = self._pixmap
+        dpr = self.devicePixelRatioF()
+        return (pixmap.devicePixelRatio() != dpr or
+                pixmap.width() != round(self.width() * dpr) or
+                pixmap.height() != round(self.height() * dpr))
+
+    def resizeEvent(self, event):
+        """Background pré-renderizado deixa de valer no novo tamanho"""
+        self._bg_pixmap = None
+        super().resizeEvent(event)
+
+    def _background_pixmap(self):
+        """Background escuro + grid horizontal sutil, renderizados uma vez por tamanho/DPR"""
+        if self._bg_pixmap is not None and not self._pixmap_stale(self._bg_pixmap):
+            return self._bg_pixmap
+
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        graph_rect = self._graph_rect()
+        painter = QPainter(pixmap)
+        painter.fillRect(graph_rect, self._bg_brush)
+        painter.setPen(self._grid_pen)
+        for i in range(1, 4):  # 25%, 50%, 75%
+            y = graph_rect.bottom() - (graph_rect.height() * i / 4)
+            painter.drawLine(QLineF(graph_rect.left(), y, graph_rect.right(), y))
+        painter.end()
+
+        self._bg_pixmap = pixmap
+        return pixmap
+
+    def _draw_lines(self, painter, throttle, brake, xs, graph_rect):
+        """Linhas minimalistas de throttle (verde) e brake (vermelho)"""
+        # Geometria resolvida uma vez e compartilhada pelos dois canais
+        bottom = graph_rect.bottom()
+        height = graph_rect.height()
+
+        # Antialiasing opcional e só com o gráfico largo; estreito não há ganho visual
+        painter.setRenderHint(QPainter.Antialiasing,
+                              self.ANTIALIAS and graph_rect.width() > self.AA_MIN_WIDTH)
+
+        # drawPolyline com QPolygonF já é o caminho rápido (sem QPainterPath/QDataStream)
+        painter.setPen(self._throttle_pen)
+        painter.drawPolyline(self._throttle_line.fill(xs, throttle, bottom, height))
+
+        painter.setPen(self._brake_pen)
+        painter.drawPolyline(self._brake_line.fill(xs, brake, bottom, height))
+
+    def _redraw_pixmap(self):
+        """Redesenho completo do gráfico no pixmap (resize / histórico enchendo)"""
+        # Parte de uma cópia do background (copy-on-write ao pintar por cima)
+        self._pixmap = QPixmap(self._background_pixmap())
+
+        graph_rect = self._graph_rect()
+        self._last_x = graph_rect.left() + graph_rect.width()
+
+        painter = QPainter(self._pixmap)
+
+        n = len(self.throttle_history)
+        if n > 1 and len(self.brake_history) > 1:
+            scale = graph_rect.width() / (n - 1)
+            buckets = int(graph_rect.width() * self._pixmap.devicePixelRatio())
+            if n > 2 * buckets:
+                # Mais amostras que colunas de pixel: desenhar só mín/máx de cada coluna
+                pos, throttle = self._minmax_buckets(self.throttle_history, buckets)
+                _, brake = self._minmax_buckets(self.brake_history, buckets)
+                self._draw_lines(painter, throttle, brake, graph_rect.left() + pos * scale, graph_rect)
+            else:
+                xs = graph_rect.left() + self._sample_axis(n) * scale
+                self._draw_lines(painter, self.throttle_history, self.brake_history, xs, graph_rect)
+        painter.end()
+
+    @staticmethod
+    def _minmax_buckets(history, buckets):
+        """Reduz o histórico a (mín, máx) por bucket, preservando os picos
+
+        Retorna (posição em índices de amostra, valores) com 2 pontos por bucket,
+        na ordem em que ocorrem (subida: mín->máx, descida: máx->mín).
+        """
+        values = np.asarray(history, dtype=np.float64)
+        edges = np.linspace(0, len(values), buckets + 1).astype(np.intp)
+        starts, ends = edges[:-1], edges[1:]
+
+        lo = np.minimum.reduceat(values, starts)
+        hi = np.maximum.reduceat(values, starts)
+        rising = values[starts] <= values[ends - 1]
+
+        ys = np.empty(2 * buckets)
+        ys[0::2] = np.where(rising, lo, hi)
+        ys[1::2] = np.where(rising, hi, lo)
+        return np.repeat((starts + ends - 1) * 0.5, 2), ys
+
+    def _scroll_pixmap(self, new_samples):
+        """Rola o pixmap para a esquerda e desenha só as amostras novas"""
+        graph_rect = self._graph_rect()
+        right = graph_rect.left() + graph_rect.width()
+        dx = graph_rect.width() / (self.max_samples - 1)
+        dpr = self._pixmap.devicePixelRatio()
+
+        # Deslocamento inteiro em pixels do dispositivo; a fração fica em _last_x
+        shift_px = round((self._last_x + new_samples * dx - right) * dpr)
+        if shift_px > 0:
+            self._pixmap.scroll(-shift_px, 0, self._pixmap.rect())
+        prev_x = self._last_x - shift_px / dpr
+        self._last_x = prev_x + new_samples * dx
+
+        # Faixa exposta pelo scroll: restaurar background + desenhar segmentos novos
+        strip_left = right - shift_px / dpr
+        strip = QRectF(strip_left, 0, self.width() - strip_left, self.height())
+
+        painter = QPainter(self._pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        # Amostras que saíram da janela rolaram para dentro da margem esquerda
+        painter.fillRect(QRectF(0, 0, graph_rect.left(), self.height()), Qt.transparent)
+        painter.setClipRect(strip)
+        # Copiar o background pronto limpa e repinta a faixa numa única operação
+        painter.drawPixmap(0, 0, self._background_pixmap())
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+        # Inclui dois pontos anteriores para emendar com o traço já existente
+        k = new_samples + 2
+        xs = prev_x + (self._sample_axis(k) - 1) * dx
+        self._draw_lines(painter, self.throttle_history[-k:], self.brake_history[-k:], xs, graph_rect)
+        painter.end()
+
+    def _sample_axis(self, n):
+        """Índices 0..n-1 como float (array cacheado, cresce sob demanda)"""
+        if len(self._x_axis) < n:
+            self._x_axis = np.arange(n, dtype=np.float64)
+        return self._x_axis[:n]
+
     def paintEvent(self, event):
         """Desenha o gráfico como áreas preenchidas (igual à imagem referência)"""
+        if self._pixmap is None or self._pixmap_stale():
+            self._redraw_pixmap()
+
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self._pixmap)
+
+# Win32 low-level keyboard hook (V = toggle visibility)
+WH_KEYBOARD_LL = 13
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+WM_QUIT = 0x0012
+PM_NOREMOVE = 0x0000
+VK_V = 0x56
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("vkCode", wintypes.DWORD),
+        ("scanCode", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
 
-        # Área de desenho
-        rect = self.rect()
-        margin = 5
-        graph_rect = rect.adjusted(margin, margin, -margin, -margin)
+if hasattr(ctypes, "WINFUNCTYPE"):
+    LowLevelKeyboardProc = ctypes.WINFUNCTYPE(ctypes.c_ssize_t, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+else:
+    LowLevelKeyboardProc = None
 
-        # Background do gráfico (escuro como na imagem)
-        painter.fillRect(graph_rect, QBrush(QColor(40, 40, 40, 200)))
+class KeyboardHookThread(QThread):
+    """Hook WH_KEYBOARD_LL numa thread própria com loop de mensagens
 
-        # Grid horizontal sutil
-        painter.setPen(QPen(QColor(80, 80, 80, 60), 1))
-        for i in range(1, 4):  # 25%, 50%, 75%
-            y = graph_rect.bottom() - (graph_rect.height() * i / 4)
-            painter.drawLine(graph_rect.left(), y, graph_rect.right(), y)
-
-        # Desenhar linhas minimalistas se temos dados
-        if len(self.throttle_history) > 1 and len(self.brake_history) > 1:
-            # Throttle line (verde) - estilo minimalista
-            painter.setPen(QPen(QColor(0, 255, 120), 2))
-            prev_point = None
-            for i, value in enumerate(self.throttle_history):
-                x = graph_rect.left() + (i * graph_rect.width() / max(1, len(self.throttle_history) - 1))
-                y = graph_rect.bottom() - (value * graph_rect.height())
-                point = QPoint(int(x), int(y))
-
-                if prev_point:
-                    painter.drawLine(prev_point, point)
-                prev_point = point
-
-            # Brake line (vermelho) - estilo minimalista
-            painter.setPen(QPen(QColor(255, 50, 80), 2))
-            prev_point = None
-            for i, value in enumerate(self.brake_history):
-                x = graph_rect.left() + (i * graph_rect.width() / max(1, len(self.brake_history) - 1))
-                y = graph_rect.bottom() - (value * graph_rect.height())
-                point = QPoint(int(x), int(y))
-
-                if prev_point:
-                    painter.drawLine(prev_point, point)
-                prev_point = point
+    Emite key_pressed na borda de descida da tecla (sem autorepeat); o sinal
+    chega à thread da UI como queued connection. A tecla nunca é consumida
+    (sempre CallNextHookEx), então V continua funcionando nos outros apps.
+    """
+    key_pressed = Signal()
+    hook_failed = Signal()
+
+    def __init__(self, vk_code):
+        super().__init__()
+        self.vk_code = vk_code
+        self._thread_id = 0
+        self._stopping = False
+        self._held = False
+        self._proc = None  # manter referência ao callback ctypes enquanto o hook existir
+
+    def run(self):
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        user32.SetWindowsHookExW.argtypes = (ctypes.c_int, LowLevelKeyboardProc, wintypes.HINSTANCE, wintypes.DWORD)
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.CallNextHookEx.restype = ctypes.c_ssize_t
+        user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        vk_code = self.vk_code
+        emit = self.key_pressed.emit
+        call_next = user32.CallNextHookEx
+
+        def hook_proc(n_code, w_param, l_param):
+            if n_code == 0:
+                info = KBDLLHOOKSTRUCT.from_address(l_param)
+                if info.vkCode == vk_code:
+                    if w_param in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                        if not self._held:
+                            self._held = True
+                            emit()
+                    elif w_param in (WM_KEYUP, WM_SYSKEYUP):
+                        self._held = False
+            return call_next(None, n_code, w_param, l_param)
+
+        # PeekMessage cria a fila de mensagens da thread; só então o id é
+        # publicado, para que o WM_QUIT de stop() nunca se perca
+        msg = wintypes.MSG()
+        user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)
+        self._thread_id = kernel32.GetCurrentThreadId()
+        if self._stopping:
+            return
+
+        self._proc = LowLevelKeyboardProc(hook_proc)
+        hook = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._proc, kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            print(f"    SetWindowsHookEx falhou (erro {ctypes.get_last_error()})")
+            self.hook_failed.emit()
+            return
+
+        # Hooks LL são chamados pelo loop de mensagens da thread que os instalou
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        user32.UnhookWindowsHookEx(hook)
+
+    def stop(self):
+        """Encerra o loop de mensagens (WM_QUIT) e aguarda a thread"""
+        self._stopping = True
+        # Reenvia até a thread sair: cobre o intervalo antes de run() publicar o id
+        for _ in range(20):
+            if self._thread_id:
+                ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            if self.wait(100):
+                return
+        print("    Hook de teclado não encerrou em 2s; finalizando a thread")
+        self.terminate()
+        self.wait()
+
+# Extrai (connection, game) do dicionário de telemetria numa única chamada em C
+_get_conn_game = operator.itemgetter('connection', 'game')
 
 class RacingTelemetryOverlay(QWidget):
     """
     Professional Racing Telemetry Overlay
     Uses Qt/PySide with appropriate window flags for overlay functionality
     """
+
+    # Stylesheets pré-montados (setStyleSheet reprocessa o QSS a cada chamada)
+    _QSS_GREEN = "color: #00FF78;"
+    _QSS_GRAY = "color: #888888;"
+    _QSS_RED_BOLD = "color: #FF4444; font-weight: bold;"
+    _QSS_YELLOW_BOLD = "color: #FFC800; font-weight: bold;"
+    _QSS_BLINK = (_QSS_YELLOW_BOLD, _QSS_RED_BOLD)
+
+    # Variação mínima de pedal (0..1) considerada mudança; abaixo disso < 1px no gráfico
+    PEDAL_EPSILON = 0.003
     def __init__(self):
         super().__init__()
 
@@ -1353,17 +1855,36 @@ class RacingTelemetryOverlay(QWidget):
         self.pedal_reader = RealPedalReader()
         self.pedal_reader.start()
 
-        # Configurar telemetria avançada separadamente
+        # Configurar telemetria avançada separadamente (iniciada no TelemetryWorker)
         self.telemetry_reader = TelemetryDataReader()
-        self.telemetry_reader.start()
 
         # Contador para debug
         self.update_count = 0
 
         # Histórico para gráfico (PRINCIPAL!)
         self.max_history = 150  # ~5 segundos a 30fps
-        self.throttle_history = []
-        self.brake_history = []
+        # Buffers circulares NumPy entregues direto ao gráfico (sem cópia por frame)
+        self.throttle_history = SampleRing(self.max_history)
+        self.brake_history = SampleRing(self.max_history)
+        self._graph_pending = 0  # amostras ainda não entregues ao gráfico
+
+        # Cache dos últimos valores exibidos (evita setValue/setText/setStyleSheet repetidos)
+        self._last_throttle_pct = None
+        self._last_brake_pct = None
+        self._last_status_text = None
+        self._last_status_qss = None
+        self._blink_on = False
+
+        # Tarefas de UI despachadas pelo tick de telemetria (sem QTimers próprios)
+        self._poll_hotkeys = False          # fallback de polling quando o hook de teclado (WH_KEYBOARD_LL) falha
+        self._check_updates_pending = True  # até a verificação de update concluir
+        self._blinking = False              # notificação de update piscando
+        self._last_t = -1.0  # Última amostra de referência (fora do range = sempre muda)
+        self._last_b = -1.0
+        self._static_samples = 0  # Amostras consecutivas dentro de PEDAL_EPSILON da referência
+
+        # Gráfico redesenhado a cada N snapshots (3 = ~10Hz; 6 = ~5Hz em máquinas fracas)
+        self.graph_frame_div = 3
 
         # Drag functionality
         self.dragging = False
@@ -1372,6 +1893,12 @@ class RacingTelemetryOverlay(QWidget):
         # Toggle visibility
         self.is_visible = True
 
+        # Fontes criadas uma vez e compartilhadas pelos labels do setup_ui
+        self._font_title = QFont("Arial", 6, QFont.Bold)
+        self._font_small = QFont("Arial", 6)
+        self._font_label = QFont("Arial", 8)
+        self._font_pct = QFont("Arial", 7)
+
         # Setup overlay
         self.setup_overlay_window()
         self.setup_ui()
@@ -1438,14 +1965,14 @@ class RacingTelemetryOverlay(QWidget):
 
         # Título
         title = QLabel("Kenji Overlay")
-        title.setFont(QFont("Arial", 6, QFont.Bold))
+        title.setFont(self._font_title)
         title.setAlignment(Qt.AlignCenter)
         title.setStyleSheet("color: rgba(255, 255, 255, 150); background-color: transparent;")
         layout.addWidget(title)
 
         # Status
         self.status_label = QLabel("Racing Telemetry - Real-time Data")
-        self.status_label.setFont(QFont("Arial", 6))
+        self.status_label.setFont(self._font_small)
         self.status_label.setStyleSheet("color: #64C8FF;")
         layout.addWidget(self.status_label)
 
@@ -1454,7 +1981,7 @@ class RacingTelemetryOverlay(QWidget):
         main_layout.setSpacing(10)
 
         # 1. Histórico dos pedais (lado esquerdo)
-        self.graph_canvas = GraphCanvas()
+        self.graph_canvas = GraphCanvas(max_samples=self.max_history)
         self.graph_canvas.setMinimumHeight(100)
         self.graph_canvas.setMinimumWidth(300)
         main_layout.addWidget(self.graph_canvas)
@@ -1465,7 +1992,7 @@ class RacingTelemetryOverlay(QWidget):
 
         throttle_label = QLabel("THR")
         throttle_label.setAlignment(Qt.AlignCenter)
-        throttle_label.setFont(QFont("Arial", 8))
+        throttle_label.setFont(self._font_label)
         throttle_container.addWidget(throttle_label)
 
         self.throttle_bar = QProgressBar()
@@ -1478,7 +2005,7 @@ class RacingTelemetryOverlay(QWidget):
 
         self.throttle_label = QLabel("0%")
         self.throttle_label.setAlignment(Qt.AlignCenter)
-        self.throttle_label.setFont(QFont("Arial", 7))
+        self.throttle_label.setFont(self._font_pct)
         throttle_container.addWidget(self.throttle_label)
 
         # Adicionar throttle ao layout principal
@@ -1490,7 +2017,7 @@ class RacingTelemetryOverlay(QWidget):
 
         brake_label = QLabel("BRK")
         brake_label.setAlignment(Qt.AlignCenter)
-        brake_label.setFont(QFont("Arial", 8))
+        brake_label.setFont(self._font_label)
         brake_container.addWidget(brake_label)
 
         self.brake_bar = QProgressBar()
@@ -1503,7 +2030,7 @@ class RacingTelemetryOverlay(QWidget):
 
         self.brake_label = QLabel("0%")
         self.brake_label.setAlignment(Qt.AlignCenter)
-        self.brake_label.setFont(QFont("Arial", 7))
+        self.brake_label.setFont(self._font_pct)
         brake_container.addWidget(self.brake_label)
 
         # Adicionar brake ao layout principal
@@ -1518,53 +2045,84 @@ class RacingTelemetryOverlay(QWidget):
 
         # Instruções com versão (usar versão já carregada)
         version_text = f"v{getattr(self, 'current_version', '1.0.0')}"
-        instructions = QLabel(f"ARRASTE para mover | V = Toggle | Ctrl+U = Update | ESC = Fechar | {version_text}")
-        instructions.setFont(QFont("Arial", 8))
-        instructions.setStyleSheet("color: #FFC800;")
-        instructions.setAlignment(Qt.AlignCenter)
-        layout.addWidget(instructions)
+        self.instructions_label = QLabel(f"ARRASTE para mover | V = Toggle | Ctrl+U = Update | ESC = Fechar | {version_text}")
+        self.instructions_label.setFont(self._font_label)
+        self.instructions_label.setStyleSheet("color: #FFC800;")
+        self.instructions_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.instructions_label)
 
 
     def setup_timer(self):
-        """Update timer for real-time data refresh"""
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_data)
-        self.update_timer.start(33)  # ~30fps
-
-        # Timer para verificar atualizações disponíveis
-        self.check_updates_timer = QTimer()
-        self.check_updates_timer.timeout.connect(self.check_for_updates_notification)
-        self.check_updates_timer.start(1000)  # Verificar a cada 1 segundo
+        """Telemetry worker for real-time data refresh (also the UI master tick)"""
+        # Aquisição fora da thread da UI; snapshots chegam via sinal (~30fps).
+        # Hotkey polling, checagem de update e blink rodam como divisores desse
+        # tick em _dispatch_ui_tasks, em vez de QTimers separados.
+        self.telemetry_worker = TelemetryWorker(self.pedal_reader, self.telemetry_reader)
+        self.telemetry_worker.data_ready.connect(self.apply_telemetry)
+        self.telemetry_worker.start()
+
+    def _dispatch_ui_tasks(self):
+        """Tarefas periódicas de UI a partir do tick de ~33ms (divisores 3 e 30)"""
+        tick = self.update_count
+        if self._poll_hotkeys and tick % 3 == 0:
+            self.check_global_hotkeys()  # ~100ms
+        if tick % 30 == 0:  # ~1s
+            if self._check_updates_pending:
+                self.check_for_updates_notification()
+            elif self._blinking:
+                self.blink_notification(self.instructions_label, self.update_status['new_version'])
 
     def setup_hotkeys(self):
-        """Configurar detecção de F12 para toggle"""
-        # Usar apenas detecção global (mais simples e funciona melhor)
-        self.hotkey_timer = QTimer()
-        self.hotkey_timer.timeout.connect(self.check_global_hotkeys)
-        self.hotkey_timer.start(100)  # Verificar a cada 100ms
+        """Configurar hotkey global V para toggle"""
         self._f12_pressed = False
+        self._keyboard_hook = None
+        self._win32api = None
+        self._pygame = None
+
+        # Preferir hook de teclado do Windows (evento, sem acordar a cada 100ms)
+        if LowLevelKeyboardProc is not None:
+            self._keyboard_hook = KeyboardHookThread(VK_V)
+            self._keyboard_hook.key_pressed.connect(self.toggle_visibility)
+            self._keyboard_hook.hook_failed.connect(self._enable_hotkey_polling)
+            self._keyboard_hook.start()
+        else:
+            self._enable_hotkey_polling()
 
         print("    V = Toggle overlay visibility")
         print("    Ctrl+U = Verificar atualizações")
 
-    def check_global_hotkeys(self):
-        """Verifica teclas globais mesmo quando overlay não tem foco"""
+    def _enable_hotkey_polling(self):
+        """Fallback: polling global a cada 3 ticks (~100ms)"""
+        self._poll_hotkeys = True
+        print("    Hook de teclado indisponível - usando polling")
+
+        # Importado uma vez aqui, não a cada chamada do polling
         try:
             import win32api
-            import win32con
+            self._win32api = win32api
+        except ImportError:
+            try:
+                import pygame
+                self._pygame = pygame
+            except ImportError:
+                pass
 
+    def check_global_hotkeys(self):
+        """Verifica teclas globais mesmo quando overlay não tem foco"""
+        win32api = self._win32api
+        if win32api is not None:
             # Verificar se V foi pressionada (0x56 é o código da tecla V)
-            if win32api.GetAsyncKeyState(0x56) & 0x8000:
+            if win32api.GetAsyncKeyState(VK_V) & 0x8000:
                 if not self._f12_pressed:
                     self._f12_pressed = True
                     self.toggle_visibility()
             else:
                 self._f12_pressed = False
 
-        except ImportError:
+        elif self._pygame is not None:
             # Fallback: usar pygame para detectar V (menos eficiente)
+            pygame = self._pygame
             try:
-                import pygame
                 keys = pygame.key.get_pressed()
                 if keys[pygame.K_v]:
                     if not self._f12_pressed:
@@ -1591,64 +2149,87 @@ class RacingTelemetryOverlay(QWidget):
         status = "VISÍVEL" if self.is_visible else "ESCONDIDO"
         print(f"Toggle: Overlay {status}")
 
-    def update_data(self):
-        """Atualiza dados do overlay"""
+    def apply_telemetry(self, snapshot):
+        """Atualiza dados do overlay com o snapshot emitido pelo TelemetryWorker"""
         self.update_count += 1
 
-        # Pega dados dos pedais (manter compatibilidade)
-        throttle = max(0, min(1, self.pedal_reader.throttle))
-        brake = max(0, min(1, self.pedal_reader.brake))
+        # Pega dados dos pedais (manter compatibilidade) - clamp 0..1 inline
+        throttle = snapshot['throttle']
+        throttle = 0.0 if throttle < 0 else 1.0 if throttle > 1 else throttle
+        brake = snapshot['brake']
+        brake = 0.0 if brake < 0 else 1.0 if brake > 1 else brake
 
-        # Adicionar ao histórico (PRINCIPAL!)
+        # Adicionar ao histórico (PRINCIPAL!) - o buffer circular sobrescreve o mais antigo
         self.throttle_history.append(throttle)
         self.brake_history.append(brake)
 
-        # Limitar histórico
-        if len(self.throttle_history) > self.max_history:
-            self.throttle_history.pop(0)
-        if len(self.brake_history) > self.max_history:
-            self.brake_history.pop(0)
+        # Histórico inteiro parado (dentro do epsilon) = gráfico igual ao último desenhado.
+        # A referência só avança quando muda de verdade, então deriva lenta não acumula.
+        eps = self.PEDAL_EPSILON
+        if abs(throttle - self._last_t) > eps or abs(brake - self._last_b) > eps:
+            self._last_t = throttle
+            self._last_b = brake
+            self._static_samples = 0
+        else:
+            self._static_samples += 1
 
         # Atualizar G-Force Circle (estilo otimizado)
-        gforce_data = self.telemetry_reader.get_gforce_data()
+        gforce_data = snapshot['gforce']
         self.gforce_circle.update_gforce(gforce_data['lateral'], gforce_data['longitudinal'])
 
-        # Atualizar gráfico de histórico dos pedais
-        self.graph_canvas.update_data(self.throttle_history, self.brake_history)
-
+        # Atualizar gráfico de histórico dos pedais (frequência reduzida, apenas se mudou)
+        self._graph_pending += 1
+        if (self.update_count % self.graph_frame_div == 0 and
+                self._static_samples < self.max_history + self.graph_frame_div):
+            self.graph_canvas.update_data(self.throttle_history, self.brake_history, self._graph_pending)
+            self._graph_pending = 0
 
         # Atualizar status da conexão
-        self.update_connection_status()
+        self.update_connection_status(snapshot['telemetry'])
 
-        # Atualiza UI
-        self.throttle_bar.setValue(int(throttle * 100))
-        self.throttle_label.setText(f"{int(throttle * 100)}%")
+        # Atualiza UI (apenas quando o percentual inteiro muda)
+        throttle_pct = int(throttle * 100)
+        if throttle_pct != self._last_throttle_pct:
+            self._last_throttle_pct = throttle_pct
+            self.throttle_bar.setValue(throttle_pct)
+            self.throttle_label.setText(f"{throttle_pct}%")
 
-        self.brake_bar.setValue(int(brake * 100))
-        self.brake_label.setText(f"{int(brake * 100)}%")
+        brake_pct = int(brake * 100)
+        if brake_pct != self._last_brake_pct:
+            self._last_brake_pct = brake_pct
+            self.brake_bar.setValue(brake_pct)
+            self.brake_label.setText(f"{brake_pct}%")
 
+        # Hotkey polling / notificação de update (divisores do mesmo tick)
+        self._dispatch_ui_tasks()
 
-    def update_connection_status(self):
+    def update_connection_status(self, telemetry_data):
         """Update connection status display"""
         try:
             # Get telemetry status
-            telemetry_data = self.telemetry_reader.get_basic_telemetry()
-            connection_status = telemetry_data.get('connection', 'Disconnected')
-            current_game = telemetry_data.get('game', 'Unknown')
+            try:
+                connection_status, current_game = _get_conn_game(telemetry_data)
+            except KeyError:
+                connection_status, current_game = 'Disconnected', 'Unknown'
 
             # Update main status label with connection info
             if connection_status == "F1 Connected":
                 status_text = "Racing Telemetry - F1 ONLINE"
-                status_color = "#00FF78"  # Green
+                status_qss = self._QSS_GREEN
             elif connection_status == "LMU Connected":
                 status_text = "Racing Telemetry - LMU ONLINE"
-                status_color = "#00FF78"  # Green
+                status_qss = self._QSS_GREEN
             else:
                 status_text = "Racing Telemetry - OFFLINE"
-                status_color = "#888888"  # Gray
+                status_qss = self._QSS_GRAY
 
-            self.status_label.setText(status_text)
-            self.status_label.setStyleSheet(f"color: {status_color};")
+            # Só reaplica texto/estilo quando o estado muda
+            if status_text != self._last_status_text:
+                self._last_status_text = status_text
+                self.status_label.setText(status_text)
+            if status_qss is not self._last_status_qss:
+                self._last_status_qss = status_qss
+                self.status_label.setStyleSheet(status_qss)
 
         except Exception as e:
             print(f"Connection status update error: {e}")
@@ -1725,12 +2306,9 @@ class RacingTelemetryOverlay(QWidget):
             # Atualizar versão armazenada
             self.current_version = __version__
 
-            # Encontrar o widget de instruções e atualizar
-            for child in self.findChildren(QLabel):
-                if "ARRASTE para mover" in child.text():
-                    child.setText(f"ARRASTE para mover | V = Toggle | Ctrl+U = Update | ESC = Fechar | v{__version__}")
-                    print(f"Versao atualizada na interface: v{__version__}")
-                    break
+            # Atualizar o widget de instruções
+            self.instructions_label.setText(f"ARRASTE para mover | V = Toggle | Ctrl+U = Update | ESC = Fechar | v{__version__}")
+            print(f"Versao atualizada na interface: v{__version__}")
         except Exception as e:
             print(f"Erro ao atualizar versao na interface: {e}")
 
@@ -1741,24 +2319,27 @@ class RacingTelemetryOverlay(QWidget):
             if self.update_notification_shown:
                 return
 
-            # Verificar se a verificação foi concluída e há atualização disponível
-            if self.update_status['checked'] and self.update_status['has_update']:
-                new_version = self.update_status['new_version']
-
-                # Encontrar o widget de instruções e adicionar a notificação
-                for child in self.findChildren(QLabel):
-                    if "ARRASTE para mover" in child.text():
-                        # Atualizar o texto com a notificação em destaque
-                        child.setText(f"NOVA VERSAO v{new_version} DISPONIVEL! Use Ctrl+U para atualizar")
-                        child.setStyleSheet("color: #FF4444; font-weight: bold;")  # Vermelho e negrito
-                        print(f"Notificacao visual mostrada: Nova versao v{new_version} disponivel!")
-                        self.update_notification_shown = True
-
-                        # Criar um timer para piscar a notificação
-                        self.blink_timer = QTimer()
-                        self.blink_timer.timeout.connect(lambda: self.blink_notification(child, new_version))
-                        self.blink_timer.start(1000)  # Piscar a cada 1 segundo
-                        break
+            # Verificação ainda não concluída (caso comum)
+            if not self.update_status['checked']:
+                return
+
+            if not self.update_status['has_update']:
+                # Verificação concluída sem atualização: nada mais a fazer
+                self._check_updates_pending = False
+                return
+
+            new_version = self.update_status['new_version']
+
+            # Atualizar o texto com a notificação em destaque
+            self.instructions_label.setText(f"NOVA VERSAO v{new_version} DISPONIVEL! Use Ctrl+U para atualizar")
+            self.instructions_label.setStyleSheet(self._QSS_RED_BOLD)  # Vermelho e negrito
+            self._blink_on = True
+            print(f"Notificacao visual mostrada: Nova versao v{new_version} disponivel!")
+            self.update_notification_shown = True
+            self._check_updates_pending = False
+
+            # Piscar a notificação a cada ~1 segundo (via _dispatch_ui_tasks)
+            self._blinking = True
 
         except Exception as e:
             print(f"Erro ao verificar notificação de atualização: {e}")
@@ -1767,11 +2348,8 @@ class RacingTelemetryOverlay(QWidget):
         """Faz a notificação de atualização piscar"""
         try:
             # Alternar entre vermelho e amarelo para chamar atenção
-            current_color = label_widget.styleSheet()
-            if "#FF4444" in current_color:
-                label_widget.setStyleSheet("color: #FFC800; font-weight: bold;")  # Amarelo
-            else:
-                label_widget.setStyleSheet("color: #FF4444; font-weight: bold;")  # Vermelho
+            self._blink_on = not self._blink_on
+            label_widget.setStyleSheet(self._QSS_BLINK[self._blink_on])
         except:
             pass
 
@@ -1779,30 +2357,20 @@ class RacingTelemetryOverlay(QWidget):
         """Cleanup ao fechar"""
         print("Limpando overlay...")
 
-        # Stop all timers
-        if hasattr(self, 'update_timer'):
-            self.update_timer.stop()
-            print("  Update timer stopped")
-        if hasattr(self, 'hotkey_timer'):
-            self.hotkey_timer.stop()
-            print("  Hotkey timer stopped")
-        if hasattr(self, 'check_updates_timer'):
-            self.check_updates_timer.stop()
-            print("  Check updates timer stopped")
-        if hasattr(self, 'blink_timer'):
-            self.blink_timer.stop()
-            print("  Blink timer stopped")
+        # Stop telemetry worker (também para o leitor de telemetria na thread dele)
+        if hasattr(self, 'telemetry_worker'):
+            self.telemetry_worker.stop()
+            print("  Telemetry worker stopped")
+
+        # Hook de teclado (tarefas periódicas param junto com o worker)
+        if getattr(self, '_keyboard_hook', None) is not None:
+            self._keyboard_hook.stop()
 
         # Stop pedal reader
         if hasattr(self, 'pedal_reader'):
             self.pedal_reader.stop()
             print("  Pedal reader stopped")
 
-        # Stop telemetry reader
-        if hasattr(self, 'telemetry_reader'):
-            self.telemetry_reader.stop()
-            print("  Telemetry reader stopped")
-
         print("Overlay cleanup complete!")
         event.accept()
 
@@ -1811,6 +2379,12 @@ def main():
     print("Baseado na análise de um projeto que REALMENTE funciona")
     print()
 
+    # Sem vsync: apresentação não fica presa ao refresh do compositor
+    # (precisa ser definido antes de criar a QApplication)
+    surface_format = QSurfaceFormat()
+    surface_format.setSwapInterval(0)
+    QSurfaceFormat.setDefaultFormat(surface_format)
+
     # Criar aplicação Qt
     app = QApplication(sys.argv)
 
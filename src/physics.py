@@ -3,7 +3,22 @@ Physics Calculations Module
 Handles G-force calculations and other physics-related computations for racing telemetry
 """
 import math
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Precomputed reciprocal of standard gravity used on the hot conversion path
+_INV_G = 1.0 / 9.81
+
+# Direction symbols indexed by (axis, sign); sign is 0 inside the ±0.1 G dead zone
+_SYM = {
+    ('longitudinal', 1): "▼",   # Forward/acceleration
+    ('longitudinal', -1): "▲",  # Backward/braking
+    ('longitudinal', 0): "●",   # Neutral
+    ('lateral', 1): "◀",        # Left
+    ('lateral', -1): "▶",       # Right
+    ('lateral', 0): "●",        # Neutral
+}
 
 
 def calculate_gforce(acceleration_value: float, gravity: float = 9.81) -> float:
@@ -34,11 +49,15 @@ def process_gforce_data(longitudinal: float, lateral: float, vertical: float = 0
     Returns:
         Dictionary containing all G-force components and total magnitude
     """
+    g_longitudinal = longitudinal * _INV_G
+    g_lateral = lateral * _INV_G
+    g_vertical = vertical * _INV_G
+
     gforce_data = {
-        'longitudinal': calculate_gforce(longitudinal),
-        'lateral': calculate_gforce(lateral),
-        'vertical': calculate_gforce(vertical),
-        'total': calculate_gforce(math.sqrt(longitudinal**2 + lateral**2 + vertical**2))
+        'longitudinal': g_longitudinal,
+        'lateral': g_lateral,
+        'vertical': g_vertical,
+        'total': math.hypot(g_longitudinal, g_lateral, g_vertical)
     }
 
     return gforce_data
@@ -55,34 +74,17 @@ def get_gforce_direction_symbol(gforce_value: float, axis: str = 'longitudinal')
     Returns:
         Unicode symbol representing direction
     """
-    threshold = 0.1
+    sign = 0 if -0.1 <= gforce_value <= 0.1 else (1 if gforce_value > 0 else -1)
+    return _SYM.get((axis, sign), "●")
 
-    if axis == 'longitudinal':
-        if gforce_value > threshold:
-            return "▼"  # Forward/acceleration
-        elif gforce_value < -threshold:
-            return "▲"  # Backward/braking
-        else:
-            return "●"  # Neutral
 
-    elif axis == 'lateral':
-        if gforce_value > threshold:
-            return "◀"  # Left
-        elif gforce_value < -threshold:
-            return "▶"  # Right
-        else:
-            return "●"  # Neutral
-
-    return "●"
-
-
-def smooth_gforce_data(new_value: float, previous_values: list, smoothing_factor: float = 0.3) -> float:
+def smooth_gforce_data(new_value: float, previous_values: Sequence[float], smoothing_factor: float = 0.3) -> float:
     """
     Apply smoothing filter to G-force data to reduce noise
 
     Args:
         new_value: Latest G-force reading
-        previous_values: List of previous readings
+        previous_values: Sequence of previous smoothed readings (only the last one is used)
         smoothing_factor: Weight for new value (0.0 to 1.0)
 
     Returns:
@@ -91,9 +93,8 @@ def smooth_gforce_data(new_value: float, previous_values: list, smoothing_factor
     if not previous_values:
         return new_value
 
-    # Simple exponential moving average
-    previous_avg = sum(previous_values) / len(previous_values)
-    return (smoothing_factor * new_value) + ((1 - smoothing_factor) * previous_avg)
+    # Exponential moving average: only the previous smoothed value is needed
+    return (smoothing_factor * new_value) + ((1 - smoothing_factor) * previous_values[-1])
 
 
 def calculate_braking_rate(longitudinal_gforce: float, is_braking: bool, not_impacted: bool = True) -> float:
@@ -136,6 +137,31 @@ def gforce_to_circle_coordinates(longitudinal: float, lateral: float,
     return (x, y)
 
 
+def _update_kernel(longitudinal: float, lateral: float, vertical: float,
+                   ema: list, peaks: list, sf: float, keep: float) -> float:
+    """
+    Fused EMA + peak update on plain floats
+
+    ema (longitudinal, lateral, vertical) and peaks (longitudinal, lateral, total)
+    are updated in place; returns the total G-force of the smoothed vector.
+    """
+    lon = ema[0] = sf * longitudinal + keep * ema[0]
+    lat = ema[1] = sf * lateral + keep * ema[1]
+    vert = ema[2] = sf * vertical + keep * ema[2]
+
+    a = abs(lon)
+    if a > peaks[0]:
+        peaks[0] = a
+    a = abs(lat)
+    if a > peaks[1]:
+        peaks[1] = a
+    a = math.hypot(lon, lat)
+    if a > peaks[2]:
+        peaks[2] = a
+
+    return math.hypot(lon, lat, vert)
+
+
 class GForceCalculator:
     """
     Advanced G-force calculator with history and filtering capabilities
@@ -144,14 +170,69 @@ class GForceCalculator:
     def __init__(self, history_size: int = 10, smoothing_factor: float = 0.3):
         self.history_size = history_size
         self.smoothing_factor = smoothing_factor
-        self.longitudinal_history = []
-        self.lateral_history = []
-        self.vertical_history = []
+        # EMA weights fixed at construction time for the update kernel
+        self._sf = smoothing_factor
+        self._keep = 1.0 - smoothing_factor
+
+        # Ring buffer of smoothed values: rows are (longitudinal, lateral, vertical)
+        self._hist = np.zeros((3, history_size), dtype=np.float32)
+        self._write_idx = 0
+        self._count = 0
 
-        # Peak tracking
-        self.max_longitudinal = 0.0
-        self.max_lateral = 0.0
-        self.max_total = 0.0
+        # Friction circle geometry set by configure_circle (radius, center x, center y)
+        self._circle_R = 1.0
+        self._circle_CX = 0.0
+        self._circle_CY = 0.0
+
+        # Exponential moving average state (longitudinal, lateral, vertical)
+        self._ema = None
+
+        # Peak tracking (longitudinal, lateral, total)
+        self._peaks = [0.0, 0.0, 0.0]
+
+    def _ordered_history(self, row: int) -> List[float]:
+        """
+        Return one axis of the ring buffer in chronological order
+
+        The list is a snapshot: it is built on each access, so read it once
+        per refresh rather than per frame, and changes to it do not reach
+        the calculator.
+        """
+        hist = self._hist[row]
+        if self._count < self.history_size:
+            return hist[:self._count].tolist()
+        idx = self._write_idx
+        return hist[idx:].tolist() + hist[:idx].tolist()
+
+    @property
+    def longitudinal_history(self) -> List[float]:
+        """Smoothed longitudinal G-force history, oldest first"""
+        return self._ordered_history(0)
+
+    @property
+    def lateral_history(self) -> List[float]:
+        """Smoothed lateral G-force history, oldest first"""
+        return self._ordered_history(1)
+
+    @property
+    def vertical_history(self) -> List[float]:
+        """Smoothed vertical G-force history, oldest first"""
+        return self._ordered_history(2)
+
+    @property
+    def max_longitudinal(self) -> float:
+        """Peak absolute longitudinal G-force"""
+        return self._peaks[0]
+
+    @property
+    def max_lateral(self) -> float:
+        """Peak absolute lateral G-force"""
+        return self._peaks[1]
+
+    @property
+    def max_total(self) -> float:
+        """Peak planar (longitudinal + lateral) G-force"""
+        return self._peaks[2]
 
     def update(self, longitudinal: float, lateral: float, vertical: float = 0.0) -> Dict[str, float]:
         """
@@ -166,28 +247,20 @@ class GForceCalculator:
             Processed G-force data with smoothing applied
         """
         # Convert to G-forces
-        raw_gforces = process_gforce_data(longitudinal, lateral, vertical)
-
-        # Apply smoothing
-        smoothed_longitudinal = smooth_gforce_data(
-            raw_gforces['longitudinal'], self.longitudinal_history, self.smoothing_factor
-        )
-        smoothed_lateral = smooth_gforce_data(
-            raw_gforces['lateral'], self.lateral_history, self.smoothing_factor
-        )
-        smoothed_vertical = smooth_gforce_data(
-            raw_gforces['vertical'], self.vertical_history, self.smoothing_factor
-        )
+        g_longitudinal = longitudinal * _INV_G
+        g_lateral = lateral * _INV_G
+        g_vertical = vertical * _INV_G
+
+        # Smoothing, peaks and total in one pass (first sample seeds the EMA)
+        if self._ema is None:
+            self._ema = [g_longitudinal, g_lateral, g_vertical]
+        total_gforce = _update_kernel(g_longitudinal, g_lateral, g_vertical,
+                                      self._ema, self._peaks, self._sf, self._keep)
+        smoothed_longitudinal, smoothed_lateral, smoothed_vertical = self._ema
 
         # Update history
         self._update_history(smoothed_longitudinal, smoothed_lateral, smoothed_vertical)
 
-        # Update peaks
-        self._update_peaks(smoothed_longitudinal, smoothed_lateral)
-
-        # Calculate total
-        total_gforce = math.sqrt(smoothed_longitudinal**2 + smoothed_lateral**2 + smoothed_vertical**2)
-
         return {
             'longitudinal': smoothed_longitudinal,
             'lateral': smoothed_lateral,
@@ -199,41 +272,43 @@ class GForceCalculator:
         }
 
     def _update_history(self, longitudinal: float, lateral: float, vertical: float):
-        """Update history buffers with new values"""
-        for history, value in [
-            (self.longitudinal_history, longitudinal),
-            (self.lateral_history, lateral),
-            (self.vertical_history, vertical)
-        ]:
-            history.append(value)
-            if len(history) > self.history_size:
-                history.pop(0)
-
-    def _update_peaks(self, longitudinal: float, lateral: float):
-        """Update peak G-force tracking"""
-        self.max_longitudinal = max(self.max_longitudinal, abs(longitudinal))
-        self.max_lateral = max(self.max_lateral, abs(lateral))
-
-        total = math.sqrt(longitudinal**2 + lateral**2)
-        self.max_total = max(self.max_total, total)
+        """Write the new values into the ring buffer, overwriting the oldest slot"""
+        self._hist[:, self._write_idx] = (longitudinal, lateral, vertical)
+        self._write_idx = (self._write_idx + 1) % self.history_size
+        if self._count < self.history_size:
+            self._count += 1
 
     def reset_peaks(self):
         """Reset peak tracking values"""
-        self.max_longitudinal = 0.0
-        self.max_lateral = 0.0
-        self.max_total = 0.0
+        self._peaks[:] = (0.0, 0.0, 0.0)
+
+    def configure_circle(self, radius: float, center_x: float, center_y: float):
+        """
+        Store the friction circle geometry used by get_circle_coordinates
 
-    def get_circle_coordinates(self, radius: float, center_x: float, center_y: float) -> Tuple[float, float]:
+        Call again whenever the display widget is resized.
+        """
+        self._circle_R = radius
+        self._circle_CX = center_x
+        self._circle_CY = center_y
+
+    def get_circle_coordinates(self, radius: Optional[float] = None, center_x: Optional[float] = None,
+                               center_y: Optional[float] = None) -> Tuple[float, float]:
         """
         Get current G-force position for friction circle display
 
+        Geometry arguments default to the values stored by configure_circle.
+
         Returns:
             Tuple of (x, y) coordinates
         """
-        if not self.longitudinal_history or not self.lateral_history:
+        if radius is None:
+            radius, center_x, center_y = self._circle_R, self._circle_CX, self._circle_CY
+
+        if not self._count:
             return (center_x, center_y)
 
-        current_long = self.longitudinal_history[-1]
-        current_lat = self.lateral_history[-1]
+        current_long, current_lat = self._hist[:2, self._write_idx - 1].tolist()
 
-        return gforce_to_circle_coordinates(current_long, current_lat, radius, center_x, center_y)
\ No newline at end of file
+        # Same mapping as gforce_to_circle_coordinates, inlined for the hot path
+        return (current_lat * radius + center_x, -current_long * radius + center_y)
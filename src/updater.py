@@ -1,4 +1,5 @@
 import json
+import hashlib
 import os
 import sys
 import tempfile
@@ -7,45 +8,195 @@ import shutil
 import time
 import subprocess
 import threading
+import functools
+import queue
 from pathlib import Path
-from urllib.request import urlopen, urlretrieve
-import tkinter as tk
-from tkinter import messagebox, ttk
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+# tkinter é importado só nas funções com interface: a verificação silenciosa
+# do startup não carrega o Tk
 
 from version import __version__, __github_repo__
 
+# Cache da resposta da API de releases (compartilhado entre execuções)
+RELEASE_CACHE_PATH = Path(tempfile.gettempdir()) / "kenjioverlay_release.json"
+RELEASE_CACHE_TTL = 6 * 60 * 60  # 6 horas
+
+@functools.lru_cache(maxsize=8)
+def _version_tuple(version):
+    """'x.y.z' -> tupla de ints (qualquer número de componentes, sem limite de valor)"""
+    return tuple(map(int, version.split('.')))
+
 class AutoUpdater:
     def __init__(self):
         self.current_version = __version__
         self.repo = __github_repo__
         self.api_url = f"https://api.github.com/repos/{self.repo}/releases/latest"
+        self._last_assets = {}  # nome do asset -> URL de download da última release consultada
+        self._last_digests = {}  # URL de download -> campo 'digest' do asset na mesma release
 
-    def check_for_updates(self, silent=False):
-        """Verifica se há uma nova versão disponível"""
-        try:
-            with urlopen(self.api_url) as response:
-                data = json.loads(response.read().decode())
+    def _api_get(self, url, headers):
+        """
+        GET na API (urlopen segue redirects e fecha a conexão)
 
-            latest_version = data['tag_name'].lstrip('v')
-            download_url = None
+        Retorna (status, headers, corpo); 304 volta como status, >= 400 levanta HTTPError.
+        """
+        headers = {'User-Agent': 'KenjiOverlay', **headers}
+        try:
+            with urlopen(Request(url, headers=headers), timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as e:
+            if e.code == 304:
+                return 304, e.headers, b''
+            raise
+
+    def _load_release_cache(self):
+        """Lê o cache da release; retorna None se ausente, corrompido ou de outro repo"""
+        try:
+            with open(RELEASE_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('api_url') == self.api_url:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save_release_cache(self, cache):
+        """Grava o cache da release (falhas de escrita são ignoradas)"""
+        try:
+            with open(RELEASE_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"Aviso: Não foi possível salvar cache da release: {e}")
+
+    def _rate_limited_until(self, headers):
+        """
+        Instante (epoch) a partir do qual a API pode ser consultada de novo
+
+        Usa Retry-After ou, com a quota esgotada, X-RateLimit-Reset.
+        Retorna 0 se a resposta não indica limite de requisições.
+        """
+        now = time.time()
+        retry_after = headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return now + int(retry_after)
+
+        reset = headers.get('X-RateLimit-Reset')
+        if headers.get('X-RateLimit-Remaining') == '0' and reset and reset.isdigit():
+            return float(reset)
+
+        return 0
+
+    def _fetch_release(self, revalidate=False):
+        """
+        Retorna o JSON da última release
+
+        Usa o cache local enquanto estiver dentro do TTL; depois (ou sempre, com
+        revalidate=True nas verificações manuais) revalida com
+        If-None-Match/If-Modified-Since (304 reaproveita o payload salvo).
+        Respeita os limites de requisição da API: enquanto bloqueado, devolve
+        o payload em cache sem acessar a rede.
+        """
+        cache = self._load_release_cache() or {'api_url': self.api_url}
+        payload = cache.get('payload')
+        now = time.time()
+
+        if not revalidate and payload is not None and now - cache.get('fetched_at', 0) < RELEASE_CACHE_TTL:
+            return payload
+
+        if now < cache.get('next_allowed_at', 0):
+            if payload is not None:
+                return payload
+            raise Exception("Limite de requisições da API do GitHub atingido. Tente novamente mais tarde.")
+
+        headers = {'Accept': 'application/vnd.github+json'}
+        if payload is not None:
+            if cache.get('etag'):
+                headers['If-None-Match'] = cache['etag']
+            if cache.get('last_modified'):
+                headers['If-Modified-Since'] = cache['last_modified']
 
-            # Procurar primeiro por executável (prioridade para auto-update)
+        try:
+            status, response_headers, body = self._api_get(self.api_url, headers)
+        except HTTPError as e:
+            until = self._rate_limited_until(e.headers) if e.code in (403, 429) else 0
+            if e.code == 429 and not until:
+                # Sem indicação do servidor: backoff exponencial (1 min .. 1 h)
+                cache['backoff'] = min(cache.get('backoff', 30) * 2, 3600)
+                until = now + cache['backoff']
+            if not until:
+                raise
+            cache['next_allowed_at'] = until
+            self._save_release_cache(cache)
+            if payload is not None:
+                return payload
+            raise
+
+        # Quota esgotada mesmo com sucesso: não consultar de novo antes do reset
+        cache['next_allowed_at'] = self._rate_limited_until(response_headers)
+        cache.pop('backoff', None)
+        cache['fetched_at'] = time.time()
+
+        if status == 304 and payload is not None:
+            # Não mudou desde a última consulta: só renovar o TTL
+            self._save_release_cache(cache)
+            return payload
+
+        payload = json.loads(body.decode())
+        cache['etag'] = response_headers.get('ETag')
+        cache['last_modified'] = response_headers.get('Last-Modified')
+        cache['payload'] = payload
+        self._save_release_cache(cache)
+        return payload
+
+    def _release_info(self, revalidate=False):
+        """Consulta a última release e retorna (versão, URL de download, changelog)"""
+        data = self._fetch_release(revalidate)
+
+        latest_version = data['tag_name'].lstrip('v')
+        download_url = None
+        self._last_assets = {asset['name']: asset['browser_download_url'] for asset in data['assets']}
+        self._last_digests = {asset['browser_download_url']: asset.get('digest') or '' for asset in data['assets']}
+
+        # Procurar primeiro por executável (prioridade para auto-update)
+        for asset in data['assets']:
+            if asset['name'] == 'KenjiOverlay.exe':
+                download_url = asset['browser_download_url']
+                break
+
+        # Se não encontrou executável, procurar por ZIP
+        if not download_url:
             for asset in data['assets']:
-                if asset['name'] == 'KenjiOverlay.exe':
+                if asset['name'].endswith('.zip'):
                     download_url = asset['browser_download_url']
+                    print(f"Debug: Usando ZIP para update: {asset['name']}")
                     break
 
-            # Se não encontrou executável, procurar por ZIP
-            if not download_url:
-                for asset in data['assets']:
-                    if asset['name'].endswith('.zip'):
-                        download_url = asset['browser_download_url']
-                        print(f"Debug: Usando ZIP para update: {asset['name']}")
-                        break
+        return latest_version, download_url, data.get('body', '')
+
+    def check_for_updates(self, silent=False):
+        """Verifica se há uma nova versão disponível"""
+        try:
+            # Só a verificação silenciosa do startup aceita o cache dentro do TTL
+            info = self._release_info(revalidate=not silent)
+        except Exception as e:
+            info = e
+        return self._handle_release_info(info, silent)
+
+    def _handle_release_info(self, info, silent):
+        """Decide o que fazer com o resultado de _release_info (ou a exceção da consulta)"""
+        if not silent:
+            from tkinter import messagebox
+
+        try:
+            if isinstance(info, Exception):
+                raise info
+
+            latest_version, download_url, changelog = info
 
             if self._is_newer_version(latest_version, self.current_version):
                 if not silent:
-                    return self._show_update_dialog(latest_version, download_url, data.get('body', ''))
+                    return self._show_update_dialog(latest_version, download_url, changelog)
                 return True, latest_version, download_url
             else:
                 if not silent:
@@ -57,14 +208,79 @@ class AutoUpdater:
                 messagebox.showerror("Erro", f"Erro ao verificar atualizações: {str(e)}")
             return False, None, None
 
+    def _check_async(self, root, callback):
+        """
+        Consulta a release numa thread e entrega o resultado no thread do Tk
+
+        A thread só coloca o resultado numa fila; o loop do Tk consulta a fila
+        via root.after e chama callback(info) - info é a tupla de
+        _release_info ou a exceção levantada.
+        """
+        results = queue.Queue(maxsize=1)
+
+        def fetch():
+            try:
+                results.put(self._release_info(revalidate=True))
+            except Exception as e:
+                results.put(e)
+
+        def poll():
+            try:
+                info = results.get_nowait()
+            except queue.Empty:
+                root.after(50, poll)
+                return
+            callback(info)
+
+        threading.Thread(target=fetch, daemon=True).start()
+        root.after(50, poll)
+
+    def check_for_updates_interactive(self):
+        """Verificação manual: janela responsiva enquanto a consulta roda em background"""
+        import tkinter as tk
+        from tkinter import ttk
+
+        root = tk.Tk()
+        root.title("Atualização")
+        root.geometry("300x90")
+        root.resizable(False, False)
+
+        # Centralizar janela
+        root.update_idletasks()
+        x = (root.winfo_screenwidth() // 2) - (300 // 2)
+        y = (root.winfo_screenheight() // 2) - (90 // 2)
+        root.geometry(f"300x90+{x}+{y}")
+
+        main_frame = ttk.Frame(root, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(main_frame, text="Verificando atualizações...").pack(pady=(0, 10))
+        progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        progress.pack(fill=tk.X)
+        progress.start()
+
+        result = {}
+
+        def on_result(info):
+            result['info'] = info
+            root.destroy()
+
+        self._check_async(root, on_result)
+        root.mainloop()
+
+        # Janela fechada antes da resposta = verificação cancelada
+        if 'info' not in result:
+            return False
+        return self._handle_release_info(result['info'], silent=False)
+
     def _is_newer_version(self, latest, current):
         """Compara versões (formato x.y.z)"""
-        def version_tuple(v):
-            return tuple(map(int, v.split('.')))
-        return version_tuple(latest) > version_tuple(current)
+        return _version_tuple(latest) > _version_tuple(current)
 
     def _show_update_dialog(self, new_version, download_url, changelog):
         """Mostra dialog perguntando se quer atualizar"""
+        import tkinter as tk
+        from tkinter import ttk
+
         root = tk.Tk()
         root.title("Atualização Disponível")
         root.geometry("500x400")
@@ -144,6 +360,8 @@ class AutoUpdater:
 
     def _use_external_updater(self, download_url):
         """Usa o updater.exe separado para atualizar"""
+        from tkinter import messagebox
+
         try:
             import sys
 
@@ -165,16 +383,16 @@ class AutoUpdater:
                 "O updater será executado.\n"
                 "O aplicativo será fechado e reiniciado automaticamente.")
 
-            # Encontrar URL do executável específico
-            exe_download_url = self._get_exe_download_url(download_url)
+            # Preferir o executável individual da release já consultada
+            exe_download_url = self._last_assets.get('KenjiOverlay.exe', download_url)
 
-            # Executar updater
-            subprocess.Popen([
-                updater_path,
-                exe_download_url or download_url,
-                current_exe,
-                backup_name
-            ])
+            # Executar updater (com o hash publicado, quando houver, para verificação)
+            # PID permite ao updater esperar o fim deste processo sem polling
+            args = [updater_path, exe_download_url, current_exe, backup_name, str(os.getpid())]
+            expected_sha256 = self._expected_sha256(exe_download_url)
+            if expected_sha256:
+                args.append(f"--sha256={expected_sha256}")
+            subprocess.Popen(args)
 
             # Fechar aplicativo atual após delay
             time.sleep(1)
@@ -183,34 +401,46 @@ class AutoUpdater:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao executar updater: {str(e)}")
 
-    def _get_exe_download_url(self, download_url):
-        """Retorna a URL correta para download (executável ou ZIP)"""
-        try:
-            # Se já é uma URL de executável, retornar como está
-            if download_url.endswith('.exe'):
-                print(f"Debug: URL é executável direto: {download_url}")
-                return download_url
-
-            # Verificar se existe executável individual na release
-            with urlopen(self.api_url) as response:
-                data = json.loads(response.read().decode())
-
-            # Procurar por executável individual
-            for asset in data['assets']:
-                if asset['name'] == 'KenjiOverlay.exe':
-                    print(f"Debug: Encontrado executável individual: {asset['browser_download_url']}")
-                    return asset['browser_download_url']
-
-            # Se não encontrou executável individual, usar ZIP
-            print(f"Debug: Executável individual não encontrado, usando ZIP: {download_url}")
-            return download_url
-
-        except Exception as e:
-            print(f"Aviso: Erro ao verificar assets: {e}")
-            return download_url
+    def _expected_sha256(self, download_url):
+        """
+        SHA-256 publicado pelo GitHub para o asset (campo 'digest'), se disponível
+
+        Usa a release já consultada por _release_info: roda no thread do Tk,
+        então não acessa a rede.
+        """
+        digest = self._last_digests.get(download_url, '')
+        if digest.startswith('sha256:'):
+            return digest[len('sha256:'):].lower()
+        return None
+
+    def _stream_download(self, download_url, dest_path, on_progress=None):
+        """
+        Baixa em blocos de 1 MiB direto para o disco calculando SHA-256 na mesma passada
+
+        on_progress(baixados, total) é chamado a cada bloco (total=0 se desconhecido).
+        Retorna o hex digest do arquivo.
+        """
+        sha256 = hashlib.sha256()
+        request = Request(download_url, headers={'Accept-Encoding': 'identity'})
+        with urlopen(request) as response, open(dest_path, 'wb') as f:
+            total = int(response.headers.get('Content-Length') or 0)
+            done = 0
+            while True:
+                chunk = response.read(1 << 20)
+                if not chunk:
+                    break
+                f.write(chunk)
+                sha256.update(chunk)
+                done += len(chunk)
+                if on_progress:
+                    on_progress(done, total)
+        return sha256.hexdigest()
 
     def _traditional_update(self, download_url):
         """Método tradicional para script Python"""
+        import tkinter as tk
+        from tkinter import messagebox, ttk
+
         progress_window = tk.Tk()
         progress_window.title("Atualizando...")
         progress_window.geometry("400x150")
@@ -228,9 +458,24 @@ class AutoUpdater:
         status_label = ttk.Label(main_frame, text="Baixando atualização...")
         status_label.pack(pady=(0, 10))
 
-        progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        progress = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
         progress.pack(fill=tk.X, pady=(0, 10))
-        progress.start()
+
+        expected_sha256 = self._expected_sha256(download_url)
+
+        last_ui = {'t': 0.0}
+
+        def report_progress(done, total):
+            # No máximo ~10 atualizações/s na fila do Tk (sempre mostra o 100%)
+            now = time.monotonic()
+            if now - last_ui['t'] < 0.1 and done != total:
+                return
+            if not last_ui['t'] and not total:
+                # Sem Content-Length: não há como medir, voltar ao modo indeterminado
+                progress_window.after(0, lambda: (progress.config(mode='indeterminate'), progress.start()))
+            last_ui['t'] = now
+            if total:
+                progress_window.after(0, progress.config, {'value': done * 100 / total})
 
         def update_in_background():
             try:
@@ -238,49 +483,45 @@ class AutoUpdater:
                 with tempfile.TemporaryDirectory() as temp_dir:
                     zip_path = os.path.join(temp_dir, "update.zip")
 
-                    # Baixar arquivo
-                    urlretrieve(download_url, zip_path)
+                    # Baixar arquivo (streaming + hash na mesma passada)
+                    digest = self._stream_download(download_url, zip_path, report_progress)
+                    if expected_sha256 and digest != expected_sha256:
+                        raise Exception("Falha na verificação de integridade (SHA-256) do download")
 
-                    status_label.config(text="Extraindo arquivos...")
+                    progress_window.after(0, status_label.config, {'text': "Instalando atualização..."})
 
-                    # Extrair ZIP
+                    # Atualizar arquivos Python direto do ZIP (sem extrair para o temp):
+                    # só os .py da pasta raiz, cada um gravado em .new e trocado atomicamente
+                    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
                     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        zip_ref.extractall(temp_dir)
-
-                    status_label.config(text="Instalando atualização...")
-
-                    # Encontrar pasta extraída
-                    extracted_folder = None
-                    for item in os.listdir(temp_dir):
-                        item_path = os.path.join(temp_dir, item)
-                        if os.path.isdir(item_path) and item != "__pycache__":
-                            extracted_folder = item_path
-                            break
-
-                    if extracted_folder:
-                        # Atualizar arquivos Python
-                        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-                        # Copiar arquivos atualizados
-                        import shutil
-                        for item in os.listdir(extracted_folder):
-                            src = os.path.join(extracted_folder, item)
-                            dst = os.path.join(current_dir, item)
-
-                            if os.path.isfile(src) and src.endswith('.py'):
-                                shutil.copy2(src, dst)
-
-                        progress_window.after(0, lambda: [
-                            progress_window.destroy(),
-                            messagebox.showinfo("Sucesso", "Atualização instalada! Reinicie o aplicativo."),
-                        ])
-                    else:
-                        raise Exception("Estrutura de arquivo inválida na atualização")
+                        infos = zip_ref.infolist()
+                        root = next((i.filename.split('/', 1)[0] for i in infos
+                                     if '/' in i.filename and i.filename.split('/', 1)[0] != "__pycache__"), None)
+                        if not root:
+                            raise Exception("Estrutura de arquivo inválida na atualização")
+
+                        prefix = root + '/'
+                        for info in infos:
+                            name = info.filename[len(prefix):]
+                            if (info.is_dir() or not info.filename.startswith(prefix)
+                                    or not name.endswith('.py') or '/' in name):
+                                continue
+                            dst = os.path.join(current_dir, name)
+                            tmp = dst + '.new'
+                            with zip_ref.open(info) as src, open(tmp, 'wb') as out:
+                                shutil.copyfileobj(src, out, 1 << 20)
+                            os.replace(tmp, dst)
+
+                    progress_window.after(0, lambda: [
+                        progress_window.destroy(),
+                        messagebox.showinfo("Sucesso", "Atualização instalada! Reinicie o aplicativo."),
+                    ])
 
             except Exception as e:
-                progress_window.after(0, lambda: [
+                # e deixa de existir ao sair do except: capturar a mensagem agora
+                progress_window.after(0, lambda msg=str(e): [
                     progress_window.destroy(),
-                    messagebox.showerror("Erro", f"Erro durante a atualização: {str(e)}")
+                    messagebox.showerror("Erro", f"Erro durante a atualização: {msg}")
                 ])
 
         # Executar download em thread separada
@@ -311,8 +552,11 @@ exit
         with open(script_path, 'w', encoding='utf-8') as f:
             f.write(script_content)
 
-        # Executar script
-        subprocess.Popen(script_path, shell=True)
+        # Executar script direto (sem shell=True) e sem janela de console visível.
+        # DETACHED_PROCESS não é usado: sem console o "timeout" do script falha.
+        subprocess.Popen([script_path],
+                         creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+                         close_fds=True)
 
     def _restart_app(self):
         """Reinicia o aplicativo"""
@@ -327,7 +571,7 @@ def check_updates_silent():
 def show_update_dialog():
     """Função para mostrar dialog de atualização manualmente"""
     updater = AutoUpdater()
-    updater.check_for_updates(silent=False)
+    updater.check_for_updates_interactive()
 
 if __name__ == "__main__":
     show_update_dialog()
\ No newline at end of file
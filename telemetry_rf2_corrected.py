@@ -5,6 +5,7 @@ Utiliza a biblioteca oficial pyRfactor2SharedMemory
 Sistema otimizado para leitura precisa de telemetria.
 """
 
+from math import isinf, isnan, sqrt
 import time
 import threading
 from typing import Optional, Tuple
@@ -17,17 +18,34 @@ except ImportError:
     RF2_AVAILABLE = False
 
 
+def _rmnan(value: float) -> float:
+    """Remove NaN/Inf (função rmnan)"""
+    return 0.0 if (isnan(value) or isinf(value)) else value
+
+
 class RF2TelemetryManager:
     """
     Gerenciador de telemetria rF2/LMU CORRIGIDO
     Utiliza biblioteca oficial pyRfactor2SharedMemory
     """
 
+    # Estados do loop de leitura
+    STATE_NO_SHM = 0        # shared memory indisponível (jogo não está rodando)
+    STATE_NOT_ON_TRACK = 1  # jogo aberto, mas fora da pista
+    STATE_ACTIVE = 2        # na pista: telemetria completa
+
     def __init__(self):
         self.api = None
         self.running = False
         self.connected = False
         self.thread = None
+        self._stop_evt = threading.Event()  # acorda o leitor imediatamente no stop()
+
+        # Estado do leitor e intervalo de polling de cada estado
+        self._state = self.STATE_NO_SHM
+        self._period = 0.033          # ACTIVE: leitura completa ~30fps
+        self._offtrack_period = 0.25  # NOT_ON_TRACK: menus/garagem
+        self._idle_period = 1.0       # NO_SHM: jogo fechado
 
         # Dados atuais de força G
         self.gforce_lateral = 0.0
@@ -48,6 +66,13 @@ class RF2TelemetryManager:
 
         # Configuração de aceleração gravitacional
         self.g_accel = 9.80665  # Constante gravitacional padrão
+        self._inv_g = 1.0 / self.g_accel  # multiplicar em vez de dividir a cada leitura
+
+        # Snapshots montados pelo leitor; os getters só devolvem a referência
+        # (a troca do atributo é atômica sob o GIL). Não modificar os dicts retornados.
+        self._gforce_snapshot = {}
+        self._basic_snapshot = {}
+        self._publish_snapshots()
 
     def start(self) -> bool:
         """Inicia leitura de telemetria"""
@@ -66,6 +91,8 @@ class RF2TelemetryManager:
 
             # Iniciar thread de leitura
             self.running = True
+            self._stop_evt.clear()
+            self._state = self.STATE_NO_SHM
             self.thread = threading.Thread(target=self._read_loop, daemon=True)
             self.thread.start()
 
@@ -77,6 +104,7 @@ class RF2TelemetryManager:
     def stop(self):
         """Para leitura de telemetria"""
         self.running = False
+        self._stop_evt.set()
 
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=2.0)
@@ -85,32 +113,54 @@ class RF2TelemetryManager:
     def _read_loop(self):
         """Loop principal de leitura de telemetria"""
 
+        # Métodos usados a cada frame resolvidos uma única vez
+        wait = self._stop_evt.wait
+        api = self.api
+        shared_memory_available = api.isSharedMemoryAvailable
+        get_tele = api.playersVehicleTelemetry
+        read_player_telemetry = self._read_player_telemetry
+
         while self.running:
+            state = self._state
             try:
-                # Verificar se RF2 está rodando e shared memory disponível
-                if not self.api.isSharedMemoryAvailable():
-                    self._reset_data()
-                    time.sleep(0.5)
-                    continue
-
-                # Verificar se o jogo está ativo
+                if state != self.STATE_ACTIVE:
+                    # Fora da pista a shared memory é reconfirmada a cada ciclo:
+                    # jogo fechado pelos menus cai no backoff de NO_SHM
+                    if not shared_memory_available():
+                        self._state = self.STATE_NO_SHM
+                        if wait(self._idle_period):
+                            return
+                        continue
+                    state = self.STATE_NOT_ON_TRACK
+
+                # Na pista? (em ACTIVE também detecta a volta aos menus)
                 if not self._is_game_active():
-                    self._reset_data()
-                    time.sleep(0.1)
+                    if state == self.STATE_ACTIVE:
+                        # Saiu da pista: reconfirmar a shared memory no próximo ciclo
+                        self._reset_data()
+                        self._state = self.STATE_NO_SHM
+                        continue
+                    self._state = self.STATE_NOT_ON_TRACK
+                    if wait(self._offtrack_period):
+                        return
                     continue
 
+                self._state = self.STATE_ACTIVE
+
                 # Ler telemetria do player
-                if self._read_player_telemetry():
+                if read_player_telemetry(get_tele):
                     self.connected = True
                     self.connection_failures = 0
                     self.last_valid_read = time.time()
+                    self._publish_snapshots()
                 else:
                     self._handle_connection_failure()
 
             except Exception as e:
                 self._handle_connection_failure()
 
-            time.sleep(0.033)  # ~30fps
+            if wait(self._period):  # ~30fps
+                return
 
     def _is_game_active(self) -> bool:
         """Verifica se o jogo está ativo"""
@@ -128,35 +178,40 @@ class RF2TelemetryManager:
         except Exception:
             return False
 
-    def _read_player_telemetry(self) -> bool:
-        """Lê telemetria do player (IMPLEMENTAÇÃO CORRETA)"""
+    def _read_player_telemetry(self, get_tele=None) -> bool:
+        """Lê telemetria do player (IMPLEMENTAÇÃO CORRETA)
+
+        get_tele: playersVehicleTelemetry já resolvido pelo loop (opcional)
+        """
         try:
             # Usar método da API para obter telemetria do player
-            vehicle_tele = self.api.playersVehicleTelemetry()
-            vehicle_scor = self.api.playersVehicleScoring()
+            vehicle_tele = (get_tele or self.api.playersVehicleTelemetry)()
 
             # FORÇA G - IMPLEMENTAÇÃO CORRETA
             # Ler aceleração diretamente do mLocalAccel (já vem em m/s²)
-            accel_x = vehicle_tele.mLocalAccel.x  # Lateral
-            accel_y = vehicle_tele.mLocalAccel.y  # Vertical
-            accel_z = vehicle_tele.mLocalAccel.z  # Longitudinal
+            local_accel = vehicle_tele.mLocalAccel
 
-            # Validar valores (função rmnan)
-            accel_x = self._rmnan(accel_x)
-            accel_y = self._rmnan(accel_y)
-            accel_z = self._rmnan(accel_z)
+            # Validar valores (função rmnan, escalar: mais barato que montar um array por leitura)
+            accel_x = _rmnan(local_accel.x)  # Lateral
+            accel_y = _rmnan(local_accel.y)  # Vertical
+            accel_z = _rmnan(local_accel.z)  # Longitudinal
+            vel_z = _rmnan(vehicle_tele.mLocalVel.z)
+            throttle = _rmnan(vehicle_tele.mUnfilteredThrottle)
+            brake = _rmnan(vehicle_tele.mUnfilteredBrake)
+            rpm = _rmnan(vehicle_tele.mEngineRPM)
 
             # Converter para G-force
-            self.gforce_lateral = accel_x / self.g_accel      # X = lateral
-            self.gforce_longitudinal = accel_z / self.g_accel  # Z = longitudinal
-            self.gforce_vertical = accel_y / self.g_accel     # Y = vertical
+            inv_g = self._inv_g
+            self.gforce_lateral = accel_x * inv_g      # X = lateral
+            self.gforce_longitudinal = accel_z * inv_g  # Z = longitudinal
+            self.gforce_vertical = accel_y * inv_g     # Y = vertical
 
             # Ler outros dados básicos
-            self.speed = max(0, self._rmnan(vehicle_tele.mLocalVel.z) * 3.6)  # Z velocity para km/h
-            self.throttle = max(0, min(100, self._rmnan(vehicle_tele.mUnfilteredThrottle) * 100))
-            self.brake = max(0, min(100, self._rmnan(vehicle_tele.mUnfilteredBrake) * 100))
+            self.speed = max(0, vel_z * 3.6)  # Z velocity para km/h
+            self.throttle = max(0, min(100, throttle * 100))
+            self.brake = max(0, min(100, brake * 100))
             self.gear = vehicle_tele.mGear
-            self.rpm = max(0, self._rmnan(vehicle_tele.mEngineRPM))
+            self.rpm = max(0, rpm)
 
             # G-force data processed
             return True
@@ -174,13 +229,6 @@ class RF2TelemetryManager:
         except Exception:
             return -1
 
-    def _rmnan(self, value: float) -> float:
-        """Remove NaN/Inf (função rmnan)"""
-        import math
-        if math.isnan(value) or math.isinf(value):
-            return 0.0
-        return value
-
     def _reset_data(self):
         """Reset dados quando jogo não está ativo"""
         self.gforce_lateral = 0.0
@@ -188,45 +236,51 @@ class RF2TelemetryManager:
         self.gforce_vertical = 0.0
         self.speed = 0.0
         self.connected = False
+        self._publish_snapshots()
 
     def _handle_connection_failure(self):
         """Gerencia falhas de conexão"""
         self.connection_failures += 1
-        self.connected = False
+        if self.connected:
+            self.connected = False
+            self._publish_snapshots()
 
         if self.connection_failures >= self.max_failures:
             self._reset_data()
-            time.sleep(0.5)  # Delay maior em caso de múltiplas falhas
-
-    def get_gforce_data(self) -> dict:
-        """Retorna dados de força G (compatível com interface existente)"""
-        import math
-
-        total_gforce = math.sqrt(
-            self.gforce_longitudinal**2 +
-            self.gforce_lateral**2 +
-            self.gforce_vertical**2
-        )
-
-        return {
-            'lateral': self.gforce_lateral,
-            'longitudinal': self.gforce_longitudinal,
-            'vertical': self.gforce_vertical,
-            'total': total_gforce
+            self._stop_evt.wait(0.5)  # Delay maior em caso de múltiplas falhas (interrompível)
+
+    def _publish_snapshots(self):
+        """Monta os dicts de força G e telemetria básica a partir do estado atual"""
+        lon = self.gforce_longitudinal
+        lat = self.gforce_lateral
+        vert = self.gforce_vertical
+        connected = self.connected
+
+        # Rebind de atributo: leitores veem o dict antigo ou o novo, nunca um parcial
+        self._gforce_snapshot = {
+            'lateral': lat,
+            'longitudinal': lon,
+            'vertical': vert,
+            'total': sqrt(lon * lon + lat * lat + vert * vert)
         }
-
-    def get_basic_telemetry(self) -> dict:
-        """Retorna dados básicos de telemetria (compatível com interface existente)"""
-        return {
+        self._basic_snapshot = {
             'throttle': self.throttle,
             'brake': self.brake,
             'speed': self.speed,
             'gear': self.gear,
             'rpm': self.rpm,
-            'game': 'Le Mans Ultimate' if self.connected else 'Disconnected',
-            'connection': 'LMU Connected' if self.connected else 'Offline'
+            'game': 'Le Mans Ultimate' if connected else 'Disconnected',
+            'connection': 'LMU Connected' if connected else 'Offline'
         }
 
+    def get_gforce_data(self) -> dict:
+        """Retorna dados de força G (compatível com interface existente)"""
+        return self._gforce_snapshot
+
+    def get_basic_telemetry(self) -> dict:
+        """Retorna dados básicos de telemetria (compatível com interface existente)"""
+        return self._basic_snapshot
+
     def is_data_valid(self) -> bool:
         """Verifica se dados são válidos"""
         return (self.connected and
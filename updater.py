@@ -1,29 +1,95 @@
 #!/usr/bin/env python3
 """
 Updater Separado - Responsável por substituir o executável principal
-Uso: updater.exe <download_url> <target_exe> <backup_name>
+Uso: updater.exe <download_url> <target_exe> <backup_name> [pid] [--sha256=<hex>] [--silent]
 """
 import sys
 import os
+import ctypes
+from ctypes import wintypes
 import time
 import shutil
-import tempfile
+import hashlib
 import zipfile
 import subprocess
+import queue
+import http.client
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from urllib.request import urlretrieve
-import tkinter as tk
-from tkinter import messagebox, ttk
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
 import threading
+# tkinter é importado só na janela de progresso: o modo --silent não carrega o Tk
 # import psutil  # Removido - causava erro no PyInstaller
 
+CHUNK_SIZE = 4 * 1024 * 1024  # bloco único de 4 MiB para rede, disco, hash e extração
+DOWNLOAD_ATTEMPTS = 3         # tentativas (cada uma retoma do offset já gravado)
+SEGMENTS = 4                  # conexões paralelas no download segmentado
+SEGMENTED_MIN_SIZE = 8 * 1024 * 1024  # abaixo disso uma conexão só já basta
+HTTP_TIMEOUT = 30
+MAX_REDIRECTS = 5
+SWAP_ATTEMPTS = 20  # troca do exe: até ~2 s esperando a imagem antiga ser liberada
+
+# Win32: espera pelo fim de um processo
+SYNCHRONIZE = 0x00100000
+WAIT_OBJECT_0 = 0
+ERROR_INVALID_PARAMETER = 87  # OpenProcess com PID que não existe mais
+COPY_FILE_NO_BUFFERING = 0x00001000
+MOVEFILE_REPLACE_EXISTING = 0x1
+MOVEFILE_WRITE_THROUGH = 0x8
+CREATE_NO_WINDOW = 0x08000000
+
+
+def _fast_copy(src, dst):
+    """Copia arquivo grande no kernel (CopyFileExW sem cache); fora do Windows, shutil.copy2"""
+    if hasattr(ctypes, 'windll'):
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CopyFileExW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+                                         ctypes.c_void_p, ctypes.POINTER(wintypes.BOOL), wintypes.DWORD)
+        kernel32.CopyFileExW.restype = wintypes.BOOL
+        cancel = wintypes.BOOL(False)
+        if kernel32.CopyFileExW(str(src), str(dst), None, None, ctypes.byref(cancel),
+                                COPY_FILE_NO_BUFFERING):
+            shutil.copystat(src, dst)
+            return
+        print(f"Aviso: CopyFileExW falhou (erro {ctypes.get_last_error()}) - usando shutil")
+    shutil.copy2(src, dst)
+
+
+def _atomic_replace(src, dst):
+    """Rename atômico que só retorna depois de gravado no disco (MoveFileExW); fora do Windows, os.replace"""
+    if hasattr(ctypes, 'windll'):
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.MoveFileExW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD)
+        kernel32.MoveFileExW.restype = wintypes.BOOL
+        if not kernel32.MoveFileExW(str(src), str(dst),
+                                    MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return
+    os.replace(src, dst)
+
+
 class StandaloneUpdater:
-    def __init__(self, download_url, target_exe, backup_name):
+    def __init__(self, download_url, target_exe, backup_name, expected_sha256=None, pid=None):
         self.download_url = download_url
+        self.pid = pid  # PID do aplicativo que chamou o updater (se informado)
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
         self.target_exe = Path(target_exe)
         self.backup_name = backup_name
+        # Staging no mesmo volume do executável: a troca final é só um rename
+        self.staging_dir = self.target_exe.parent / ".update_tmp"
+        # Conexões HTTP(S) persistentes, uma por host em cada thread
+        self._http = threading.local()
+        # Tipo do pacote decidido uma vez: ZIP (extrair o exe) ou o próprio exe
+        self._fetch = self._fetch_zip if download_url.lower().endswith('.zip') else self._fetch_exe
+
+        self._build_window()
+
+    def _build_window(self):
+        """Cria a janela de progresso"""
+        import tkinter as tk
+        from tkinter import ttk
 
-        # Criar janela de progresso
         self.root = tk.Tk()
         self.root.title("Atualizando Racing Telemetry...")
         self.root.geometry("400x150")
@@ -49,94 +115,431 @@ class StandaloneUpdater:
         self.detail_label = ttk.Label(main_frame, text="", font=("Arial", 8))
         self.detail_label.pack()
 
+        # A thread de atualização só enfileira eventos; widgets são tocados apenas pelo mainloop
+        self._ui_queue = queue.Queue()
+        self.root.after(50, self._pump_ui)
+
     def update_status(self, message, detail=""):
         """Atualiza status na interface"""
-        self.status_label.config(text=message)
-        self.detail_label.config(text=detail)
-        self.root.update()
+        self._ui_queue.put(("status", message, detail))
+
+    def update_progress(self, downloaded, total):
+        """Barra determinada quando o tamanho total é conhecido"""
+        self._ui_queue.put(("progress", downloaded, total))
+
+    def show_error(self, message):
+        """Mostra o erro na thread da interface"""
+        self._ui_queue.put(("error", message))
+
+    def finish(self):
+        """Fecha a janela depois de processar os eventos pendentes"""
+        self._ui_queue.put(("done",))
+
+    def _pump_ui(self):
+        """Aplica os eventos enfileirados pela thread de atualização (roda no mainloop)"""
+        while True:
+            try:
+                kind, *args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "status":
+                self.status_label.config(text=args[0])
+                self.detail_label.config(text=args[1])
+            elif kind == "progress":
+                downloaded, total = args
+                if total:
+                    if str(self.progress['mode']) != 'determinate':
+                        self.progress.stop()
+                        self.progress.config(mode='determinate', maximum=total)
+                    self.progress.config(value=downloaded)
+                    detail = f"{downloaded / 1048576:.1f} / {total / 1048576:.1f} MB"
+                else:
+                    detail = f"{downloaded / 1048576:.1f} MB"
+                self.detail_label.config(text=detail)
+            elif kind == "error":
+                from tkinter import messagebox
+                self.progress.stop()
+                messagebox.showerror("Erro na Atualização", args[0])
+            elif kind == "done":
+                self.root.destroy()
+                return
+        self.root.after(50, self._pump_ui)
+
+    def _connection(self, parts):
+        """Conexão da thread atual com o host de parts (criada sob demanda)"""
+        conns = getattr(self._http, 'conns', None)
+        if conns is None:
+            conns = self._http.conns = {}
+        key = (parts.scheme, parts.netloc)
+        conn = conns.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            conn = conns[key] = conn_class(parts.netloc, timeout=HTTP_TIMEOUT)
+        return conn
+
+    def _close_connections(self):
+        """Fecha as conexões da thread atual (fim do trabalho ou resposta lida pela metade)"""
+        for conn in getattr(self._http, 'conns', {}).values():
+            conn.close()
+        self._http.conns = {}
+
+    def _request(self, method, url, headers=None):
+        """
+        Requisição reaproveitando a conexão da thread (evita novo handshake TLS)
+
+        Segue redirects; retorna (resposta, URL final). Status >= 400 levanta HTTPError.
+        """
+        # Executável/ZIP já são comprimidos: gzip só atrapalharia o Range e o hash
+        headers = {'User-Agent': 'KenjiOverlay-Updater', 'Accept-Encoding': 'identity', **(headers or {})}
+
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = (parts.path or '/') + (f"?{parts.query}" if parts.query else "")
+            for attempt in range(2):
+                conn = self._connection(parts)
+                try:
+                    conn.request(method, path, headers=headers)
+                    response = conn.getresponse()
+                    break
+                except (http.client.HTTPException, ConnectionError):
+                    # Servidor fechou a conexão ociosa: reconectar uma vez
+                    self._close_connections()
+                    if attempt:
+                        raise
+
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.read()  # esvaziar antes de reutilizar a conexão
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                response.read()
+                raise HTTPError(url, response.status, response.reason, response.headers, None)
+            return response, url
+        raise URLError(f"redirects demais: {url}")
+
+    def _partial_path(self, url):
+        """Arquivo parcial persistente no staging (sobrevive a um crash do updater)
+
+        O hash da URL entra no nome: a URL de release inclui a tag da versão,
+        então bytes de versões diferentes nunca são misturados.
+        """
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return self.staging_dir / f"KenjiOverlay-update-{digest}.partial"
+
+    @staticmethod
+    def _hash_file(path, sha256):
+        """Alimenta o hash com o conteúdo de um arquivo já gravado"""
+        with open(path, 'rb') as fh:
+            while True:
+                chunk = fh.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+        return sha256
+
+    def _download_once(self, url, partial):
+        """Um GET (com Range se já houver bytes gravados) anexando ao arquivo parcial
+
+        Retorna o SHA-256 do arquivo completo, calculado na mesma passada do download.
+        """
+        sha256 = hashlib.sha256()
+        offset = partial.stat().st_size if partial.exists() else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+
+        try:
+            resp, _ = self._request('GET', url, headers)
+        except HTTPError as e:
+            if e.code == 416 and offset:
+                # Parcial inválido para este arquivo: recomeçar do zero
+                partial.unlink()
+                return self._download_once(url, partial)
+            raise
+
+        with resp:
+            if resp.status == 206:
+                # Content-Range: bytes <início>-<fim>/<total>
+                total = int(resp.headers.get('Content-Range', '').rpartition('/')[2] or 0)
+                mode = 'ab'
+                # Retomada: os bytes já gravados entram no hash antes dos novos
+                self._hash_file(partial, sha256)
+            else:
+                # Servidor ignorou o Range: baixar tudo de novo
+                offset = 0
+                total = int(resp.headers.get('Content-Length') or 0)
+                mode = 'wb'
+
+            downloaded = offset
+            with open(partial, mode) as fh:
+                while True:
+                    chunk = resp.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    fh.write(chunk)
+                    sha256.update(chunk)
+                    downloaded += len(chunk)
+                    self.update_progress(downloaded, total)
+
+        if total and downloaded < total:
+            raise URLError(f"download incompleto ({downloaded} de {total} bytes)")
+        self.update_progress(downloaded, total)
+        return sha256.hexdigest()
+
+    def _sidecar_sha256(self, url):
+        """Hash publicado em <url>.sha256 (formato sha256sum), se existir"""
+        try:
+            resp, _ = self._request('GET', url + '.sha256')
+            with resp:
+                token = resp.read().decode('ascii', 'ignore').split()
+            if token and len(token[0]) == 64:
+                return token[0].lower()
+        except (URLError, OSError, ValueError, http.client.HTTPException):
+            pass
+        return None
+
+    def _verify_sha256(self, url, path, digest):
+        """Compara com o hash esperado (argumento ou sidecar); apaga o arquivo se não conferir"""
+        expected = self.expected_sha256 or self._sidecar_sha256(url)
+        if not expected:
+            print("Aviso: hash SHA-256 esperado indisponível - download não verificado")
+            return
+        if digest != expected:
+            os.remove(path)
+            raise Exception(f"Arquivo corrompido (SHA-256 {digest[:12]}... esperado {expected[:12]}...)")
+
+    def _probe_ranges(self, url):
+        """HEAD: (URL final após redirects, tamanho) se o servidor aceita Range, senão (url, 0)"""
+        try:
+            resp, final_url = self._request('HEAD', url)
+            with resp:
+                if resp.headers.get('Accept-Ranges', '').lower() != 'bytes':
+                    return url, 0
+                return final_url, int(resp.headers.get('Content-Length') or 0)
+        except (URLError, OSError, ValueError, http.client.HTTPException):
+            return url, 0
+
+    def _download_segmented(self, url, dest, total):
+        """Range GETs paralelos em janelas disjuntas de um arquivo pré-alocado"""
+        size = -(-total // SEGMENTS)
+        ranges = [(start, min(start + size, total)) for start in range(0, total, size)]
+
+        # Só truncate: SetFileValidData exigiria SE_MANAGE_VOLUME_NAME e, num
+        # download interrompido, deixaria dados antigos do disco no arquivo
+        with open(dest, 'wb') as fh:
+            fh.truncate(total)
+
+        lock = threading.Lock()
+        downloaded = [0]
+
+        def fetch(start, end):
+            try:
+                fetch_range(start, end)
+            finally:
+                self._close_connections()
+
+        def fetch_range(start, end):
+            pos = start
+            for attempt in range(DOWNLOAD_ATTEMPTS):
+                try:
+                    # Retry do segmento continua de onde ele parou
+                    resp, _ = self._request('GET', url, {'Range': f'bytes={pos}-{end - 1}'})
+                    with resp, open(dest, 'r+b') as fh:
+                        if resp.status != 206:
+                            raise ValueError("servidor ignorou o Range")
+                        fh.seek(pos)
+                        while pos < end:
+                            chunk = resp.read(min(CHUNK_SIZE, end - pos))
+                            if not chunk:
+                                break
+                            fh.write(chunk)
+                            pos += len(chunk)
+                            with lock:
+                                downloaded[0] += len(chunk)
+                    if pos >= end:
+                        return
+                    raise URLError(f"segmento incompleto ({pos - start} de {end - start} bytes)")
+                except HTTPError as e:
+                    if e.code < 500 or attempt == DOWNLOAD_ATTEMPTS - 1:
+                        raise
+                except (URLError, OSError, http.client.HTTPException):
+                    self._close_connections()
+                    if attempt == DOWNLOAD_ATTEMPTS - 1:
+                        raise
+                time.sleep(2 ** attempt)  # backoff exponencial por segmento
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(fetch, start, end) for start, end in ranges]
+            pending = futures
+            while pending:
+                _, pending = wait(pending, timeout=0.25)
+                self.update_progress(downloaded[0], total)
+            for future in futures:
+                future.result()  # propaga a primeira falha
+
+    def _download(self, url, dest):
+        """Baixa url para dest, retomando downloads interrompidos via HTTP Range
+
+        Sem parcial anterior e com arquivo grande, tenta primeiro o download
+        segmentado em paralelo; se falhar, cai para o stream único.
+        """
+        partial = self._partial_path(url)
+        if not partial.exists():
+            final_url, total = self._probe_ranges(url)
+            if total >= SEGMENTED_MIN_SIZE:
+                segmented = partial.with_suffix('.segments')
+                try:
+                    self._download_segmented(final_url, segmented, total)
+                    # Segmentos chegam fora de ordem: hash numa passada após o download
+                    digest = self._hash_file(segmented, hashlib.sha256()).hexdigest()
+                    self._verify_sha256(url, segmented, digest)
+                    os.replace(segmented, dest)
+                    return
+                except (URLError, OSError, ValueError, http.client.HTTPException) as e:
+                    print(f"Aviso: download segmentado falhou ({e}) - usando conexão única")
+                    try:
+                        segmented.unlink()
+                    except OSError:
+                        pass
+
+        last_error = None
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            try:
+                digest = self._download_once(url, partial)
+            except (URLError, OSError, http.client.HTTPException) as e:
+                if isinstance(e, HTTPError) and e.code < 500:
+                    raise
+                self._close_connections()
+                last_error = e
+                print(f"Aviso: download interrompido ({e}) - retomando")
+                time.sleep(1 + attempt)
+                continue
+
+            self._verify_sha256(url, partial, digest)
+            os.replace(partial, dest)
+            return
+        raise last_error
+
+    def _wait_for_pid(self, pid, timeout):
+        """Espera o processo terminar com um único WaitForSingleObject
+
+        Retorna True/False, ou None se não foi possível abrir o processo
+        (ex.: acesso negado) e o chamador deve usar outro método.
+        """
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+        handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        if not handle:
+            if ctypes.get_last_error() == ERROR_INVALID_PARAMETER:
+                return True  # processo já terminou
+            return None
+        try:
+            return kernel32.WaitForSingleObject(handle, int(timeout * 1000)) == WAIT_OBJECT_0
+        finally:
+            kernel32.CloseHandle(handle)
 
     def wait_for_process_end(self, process_name, timeout=30):
         """Aguarda um processo específico terminar (sem psutil)"""
         self.update_status("Aguardando aplicativo fechar...", f"Processo: {process_name}")
 
+        # Com o PID do chamador: espera no kernel, retorna no instante em que ele sai
+        if self.pid and hasattr(ctypes, 'windll'):
+            finished = self._wait_for_pid(self.pid, timeout)
+            if finished is not None:
+                return finished
+
         start_time = time.time()
         while time.time() - start_time < timeout:
-            # Usar tasklist do Windows para verificar processo
+            # Usar tasklist do Windows para verificar processo (direto, sem cmd.exe)
             try:
-                import subprocess
-                result = subprocess.run(['tasklist', '/FI', f'IMAGENAME eq {process_name}'],
-                                      capture_output=True, text=True, shell=True)
+                result = subprocess.run(['tasklist', '/NH', '/FI', f'IMAGENAME eq {process_name}'],
+                                      capture_output=True, text=True, creationflags=CREATE_NO_WINDOW)
                 if process_name.lower() not in result.stdout.lower():
                     return True
             except:
-                # Se tasklist falhou, aguardar tempo fixo
-                time.sleep(2)
+                # Sem tasklist não há como verificar; a troca do exe já repete se o arquivo estiver preso
                 return True
 
             time.sleep(1)
 
         return False
 
+    def _fetch_zip(self, temp_dir):
+        """Baixa o ZIP e extrai só o executável; retorna o caminho do exe"""
+        zip_path = os.path.join(temp_dir, "update.zip")
+        self._download(self.download_url, zip_path)
+
+        self.update_status("Extraindo arquivos...")
+
+        # Extrair só o executável, em streaming, parando no primeiro encontrado
+        new_exe = None
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                file = info.filename.rsplit('/', 1)[-1]
+                if info.is_dir() or not (file.endswith('.exe') and 'KenjiOverlay' in file):
+                    continue
+
+                print(f"Debug: Encontrou executável: {file}")
+                new_exe = os.path.join(temp_dir, file)
+                with zip_ref.open(info) as src, open(new_exe, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, length=CHUNK_SIZE)
+                break
+
+            if not new_exe:
+                # Listar todos os arquivos para debug
+                print("Debug: Arquivos encontrados no ZIP:")
+                for name in zip_ref.namelist():
+                    print(f"  - {name}")
+                raise Exception("Executável KenjiOverlay.exe não encontrado no arquivo de atualização")
+
+        # O ZIP não é mais necessário
+        os.remove(zip_path)
+        return new_exe
+
+    def _fetch_exe(self, temp_dir):
+        """Baixa o executável diretamente; retorna o caminho do exe"""
+        new_exe = os.path.join(temp_dir, "KenjiOverlay.exe")
+        self._download(self.download_url, new_exe)
+
+        if not os.path.exists(new_exe):
+            raise Exception("Falha ao baixar o executável")
+        return new_exe
+
     def download_update(self):
         """Baixa o arquivo de atualização"""
         try:
             self.update_status("Baixando atualização...", self.download_url)
 
-            # Criar arquivo temporário
-            temp_dir = tempfile.mkdtemp()
-
-            # Verificar se é um ZIP ou executável direto
-            if self.download_url.endswith('.zip'):
-                # Baixar e extrair ZIP
-                zip_path = os.path.join(temp_dir, "update.zip")
-                urlretrieve(self.download_url, zip_path)
-
-                self.update_status("Extraindo arquivos...")
+            # Staging ao lado do executável (mesmo volume)
+            temp_dir = str(self.staging_dir)
+            os.makedirs(temp_dir, exist_ok=True)
 
-                extract_dir = os.path.join(temp_dir, "extracted")
-                os.makedirs(extract_dir, exist_ok=True)
-
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
-
-                # Encontrar o executável
-                new_exe = None
-                for root, dirs, files in os.walk(extract_dir):
-                    for file in files:
-                        if file.endswith('.exe') and 'KenjiOverlay' in file:
-                            new_exe = os.path.join(root, file)
-                            print(f"Debug: Encontrou executável: {file}")
-                            break
-                    if new_exe:
-                        break
-
-                if not new_exe:
-                    # Listar todos os arquivos para debug
-                    print("Debug: Arquivos encontrados no ZIP:")
-                    for root, dirs, files in os.walk(extract_dir):
-                        for file in files:
-                            print(f"  - {file}")
-                    raise Exception("Executável KenjiOverlay.exe não encontrado no arquivo de atualização")
-            else:
-                # Baixar executável diretamente
-                new_exe = os.path.join(temp_dir, "KenjiOverlay.exe")
-                urlretrieve(self.download_url, new_exe)
-
-                if not os.path.exists(new_exe):
-                    raise Exception("Falha ao baixar o executável")
-
-            return new_exe, temp_dir
+            return self._fetch(temp_dir), temp_dir
 
         except Exception as e:
             raise Exception(f"Erro ao baixar atualização: {str(e)}")
 
+        finally:
+            self._close_connections()
+
     def backup_current_exe(self):
-        """Cria backup do executável atual"""
+        """Cria backup do executável atual (hardlink NTFS: nenhum byte copiado)"""
         try:
             if self.target_exe.exists():
                 backup_path = self.target_exe.parent / self.backup_name
                 self.update_status("Criando backup...", str(backup_path))
-                shutil.copy2(self.target_exe, backup_path)
+                if backup_path.exists():
+                    backup_path.unlink()
+                try:
+                    # O exe continua no lugar até o os.replace, que só desfaz o link
+                    os.link(self.target_exe, backup_path)
+                except OSError:
+                    # Sem suporte a hardlink (outro volume, FAT/exFAT): copiar
+                    _fast_copy(self.target_exe, backup_path)
                 return backup_path
         except Exception as e:
             print(f"Aviso: Não foi possível criar backup: {e}")
@@ -144,28 +547,34 @@ class StandaloneUpdater:
 
     def replace_executable(self, new_exe_path):
         """Substitui o executável principal"""
+        backup_path = None
         try:
             self.update_status("Substituindo executável...", str(self.target_exe))
 
             # Aguardar processo terminar
             process_name = self.target_exe.name
             if not self.wait_for_process_end(process_name):
-                # Tentar forçar fechamento com taskkill
+                # Tentar forçar fechamento com taskkill e esperar o processo sair de fato
                 try:
                     subprocess.run(['taskkill', '/F', '/IM', process_name],
-                                 capture_output=True, shell=True)
-                    time.sleep(2)
+                                 capture_output=True, creationflags=CREATE_NO_WINDOW)
+                    self.wait_for_process_end(process_name, timeout=5)
                 except:
                     pass
 
-            # Aguardar um pouco mais para garantir
-            time.sleep(2)
-
             # Criar backup
             backup_path = self.backup_current_exe()
 
-            # Substituir arquivo
-            shutil.copy2(new_exe_path, self.target_exe)
+            # Substituir arquivo (staging no mesmo volume: rename atômico). A imagem do exe
+            # pode ficar presa um instante após o processo sair: repetir em vez de esperar fixo
+            for attempt in range(SWAP_ATTEMPTS):
+                try:
+                    _atomic_replace(new_exe_path, self.target_exe)
+                    break
+                except PermissionError:
+                    if attempt == SWAP_ATTEMPTS - 1:
+                        raise
+                    time.sleep(0.1)
 
             self.update_status("Atualização concluída!", "Reiniciando aplicativo...")
 
@@ -175,7 +584,7 @@ class StandaloneUpdater:
             # Tentar restaurar backup se falhou
             if backup_path and backup_path.exists():
                 try:
-                    shutil.copy2(backup_path, self.target_exe)
+                    _atomic_replace(backup_path, self.target_exe)
                 except:
                     pass
             raise Exception(f"Erro ao substituir executável: {str(e)}")
@@ -183,7 +592,6 @@ class StandaloneUpdater:
     def restart_application(self):
         """Reinicia o aplicativo principal"""
         try:
-            time.sleep(1)
             subprocess.Popen([str(self.target_exe)], cwd=str(self.target_exe.parent))
             return True
         except Exception as e:
@@ -193,6 +601,7 @@ class StandaloneUpdater:
     def run_update(self):
         """Executa o processo completo de atualização"""
         temp_dir = None
+        success = False
         try:
             # 1. Baixar atualização
             new_exe_path, temp_dir = self.download_update()
@@ -208,36 +617,66 @@ class StandaloneUpdater:
                 self.update_status("Atualizacao concluida", "Inicie o aplicativo manualmente")
                 time.sleep(3)
 
+            success = True
             return True
 
         except Exception as e:
-            self.progress.stop()
-            messagebox.showerror("Erro na Atualização", str(e))
+            self.show_error(str(e))
             return False
 
         finally:
-            # Limpar arquivos temporários
-            if temp_dir and os.path.exists(temp_dir):
+            # Limpar staging só no sucesso: em caso de falha o .partial fica para retomar
+            if success and temp_dir:
                 try:
-                    shutil.rmtree(temp_dir)
-                except:
+                    # Exe movido e ZIP removido: normalmente só resta o diretório vazio
+                    os.rmdir(temp_dir)
+                except FileNotFoundError:
                     pass
+                except OSError:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+
+class HeadlessUpdater(StandaloneUpdater):
+    """Mesmo fluxo de atualização, sem janela: status no stdout, erros no stderr"""
+
+    def _build_window(self):
+        pass
+
+    def update_status(self, message, detail=""):
+        print(f"{message} {detail}".rstrip(), flush=True)
+
+    def update_progress(self, downloaded, total):
+        pass
+
+    def show_error(self, message):
+        print(f"Erro na Atualização: {message}", file=sys.stderr, flush=True)
+
+    def finish(self):
+        pass
 
 def main():
-    if len(sys.argv) != 4:
-        print("Uso: updater.exe <download_url> <target_exe> <backup_name>")
+    # Opções --nome=valor podem vir em qualquer posição
+    options = dict(arg[2:].partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('--'))
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) not in (3, 4) or (len(args) == 4 and not args[3].isdigit()):
+        print("Uso: updater.exe <download_url> <target_exe> <backup_name> [pid] [--sha256=<hex>] [--silent]")
         return 1
 
-    download_url = sys.argv[1]
-    target_exe = sys.argv[2]
-    backup_name = sys.argv[3]
+    download_url, target_exe, backup_name = args[:3]
+    pid = int(args[3]) if len(args) == 4 else None
+
+    if 'silent' in options:
+        # Sem interface: roda na thread principal e o código de saída indica o resultado
+        updater = HeadlessUpdater(download_url, target_exe, backup_name,
+                                  expected_sha256=options.get('sha256'), pid=pid)
+        return 0 if updater.run_update() else 1
 
-    updater = StandaloneUpdater(download_url, target_exe, backup_name)
+    updater = StandaloneUpdater(download_url, target_exe, backup_name,
+                                expected_sha256=options.get('sha256'), pid=pid)
 
     # Executar atualização em thread separada
     def run_update_thread():
         success = updater.run_update()
-        updater.root.after(0, lambda: updater.root.destroy())
+        updater.finish()
 
     threading.Thread(target=run_update_thread, daemon=True).start()
 